@@ -3,16 +3,23 @@
 """
 Auto Transfer Bot for T80S Telescope:
 This module containg the class that perform the automatic data Transfer
-process every day in a given time.
+process as soon as new data are found and every day in a given time.
 """
-import time
+import asyncio
 from datetime import datetime, timedelta
-import sched
 import os
 # from subprocess import check_call, CalledProcessError
 import copy
 import logging
 
+from config import PATH_ROOT, TRANSFER_DEST_ROOT, TRANSFER_WORKERS
+from config import TRANSFER_BANDWIDTH
+from config import TRANSFER_POLL_SECONDS, TRANSFER_MAX_POLL_SECONDS
+from config import METRICS_PORT
+from metrics import TransferMetrics
+from newdata import DataWatcher, as_datetime
+from transfer import TransferEngine, tile_manifest
+
 
 __AUTHOR = "E. S. Pereira"
 __DATE = "14/06/2017"
@@ -28,8 +35,18 @@ class Autotransferbot(object):
         about the reduction process
     Optional Attr:
         client_ip: IP of the machine that the bot is running
-        delta_time_hours: Time range between reductions
+        delta_time_hours: Time range between fixed time Transfers
+        poll_seconds: Interval between searches for new data
+        max_poll_seconds: Maximum interval between searches, reached
+        while there is nothing new
         work_dir: The location where the bot will save temp data and log files
+        dest_dir: The location where the data will be transferred, an
+        absolute path. default config.TRANSFER_DEST_ROOT, which must be
+        set otherwise
+        transfer_workers: Number of threads copying files
+        metrics_port: Port of the HTTP endpoint of the metrics, None for no
+        endpoint. The metrics are always written to metrics.prom and
+        appended to metrics.jsonl in work_dir after each Transfer.
     """
 
     def __init__(self,
@@ -38,15 +55,24 @@ class Autotransferbot(object):
                  **kwargs):
 
         client_ip = "localhost"
-        self._delta_time_hours = 24,
+        self._delta_time_hours = 24
+        self._poll_seconds = TRANSFER_POLL_SECONDS
+        self._max_poll_seconds = TRANSFER_MAX_POLL_SECONDS
         self._work_dir = "./"
+        self._dest_dir = TRANSFER_DEST_ROOT
+        self._transfer_workers = TRANSFER_WORKERS
+        self._metrics_port = METRICS_PORT
 
         allowed_keys = set(['client_ip',
                             'delta_time_hours',
-                            'work_dir'])
+                            'poll_seconds',
+                            'max_poll_seconds',
+                            'work_dir',
+                            'dest_dir',
+                            'transfer_workers',
+                            'metrics_port'])
 
-        self._scheduler = sched.scheduler(timefunc=time.time,
-                                          delayfunc=time.sleep)
+        self._cycle_lock = None
 
         self._next_transfer = datetime.now()
         self.useremail = useremail
@@ -72,20 +98,36 @@ class Autotransferbot(object):
         if os.path.isdir(self._work_dir + "botLoggin") is False:
             os.makedirs(self._work_dir + "botLoggin")
 
-        self._logger = logging.getLogger()
+        # A logger of its own: records of other libraries (asyncio) do not
+        # carry the clientip and user fields of the format.
+        self._logger = logging.getLogger("autotransferbot")
+        self._logger.propagate = False
 
         _format = "%(asctime)-15s %(clientip)s %(user)-8s %(message)s"
 
         loggin_name = "reduction_{}.log".format(
             datetime.now().strftime("%Y%m%dT%H:%M:%S"))
 
-        logging.basicConfig(filename=self._work_dir + "/botLoggin/"
-                            + loggin_name,
-                            level=logging.DEBUG,
-                            format=_format)
+        handler = logging.FileHandler(self._work_dir + "/botLoggin/"
+                                      + loggin_name)
+        handler.setFormatter(logging.Formatter(_format))
+        self._logger.addHandler(handler)
+        self._logger.setLevel(logging.DEBUG)
 
         self._logger.info("The Transfer Bot is Starting.", extra=self._extra)
 
+        self._watcher = DataWatcher(self._work_dir)
+        self._metrics = TransferMetrics()
+        ledger_path = self._work_dir + "transfer_ledger.sqlite"
+        self._engine = TransferEngine(PATH_ROOT,
+                                      self._dest_dir,
+                                      ledger_path,
+                                      workers=self._transfer_workers,
+                                      bandwidth=TRANSFER_BANDWIDTH,
+                                      metrics=self._metrics)
+        if self._metrics_port is not None:
+            self._metrics.serve(self._metrics_port)
+
     def get_next_transfer(self):
         """
         Return a date object representing the next Transfer date time.
@@ -94,66 +136,152 @@ class Autotransferbot(object):
 
     def has_newData(self):
         """
-        Verify if there are new reduced data.
+        Verify if there are new reduced data since the last Transfer.
         """
-        return True
+        with self._metrics.stage("db_query"):
+            news = self._watcher.poll()
+        if len(news) > 0:
+            self._logger.info("New data in: {}".format(", ".join(news)),
+                              extra=self._extra)
+            return True
+        self._logger.info("No new data.", extra=self._extra)
+        return False
 
     def _start_transfer(self):
-        pass
-
-    def _rescheduler(self):
-        self._next_transfer = datetime.now() + \
-            timedelta(hours=self._delta_time_hours)
-
-        if self.has_newData() is True:
-            self._start_transfer()
+        """
+        Transfer the tile images updated since the last Transfer. The
+        t80oa exposures and t80tilescatalogs files are not transferred
+        (see transfer.tile_manifest).
+        Return True if all files were transferred.
+        """
+        since = as_datetime(self._watcher.marks.get("UPDATEDATE_tile"))
+        with self._metrics.stage("db_query"):
+            manifest = tile_manifest(since)
+        self._logger.info("Transferring {} files.".format(len(manifest)),
+                          extra=self._extra)
+
+        summary = self._engine.run(manifest)
+        for item, error in summary["failed"]:
+            self._logger.error("Transfer of {0} failed: {1}".format(
+                item.relpath, error), extra=self._extra)
+
+        info = "Transfer finished. Done: {0}. Skipped: {1}. Failed: {2}."
+        self._logger.info(info.format(len(summary["done"]),
+                                      len(summary["skipped"]),
+                                      len(summary["failed"])),
+                          extra=self._extra)
+        self._write_metrics()
+        return len(summary["failed"]) == 0
+
+    def _write_metrics(self):
+        """
+        Write the metrics to the Prometheus text file and the JSON lines
+        log in the work directory.
+        """
+        try:
+            self._metrics.write_prometheus(self._work_dir + "metrics.prom")
+            self._metrics.append_jsonl(self._work_dir + "metrics.jsonl")
+        except OSError as err:
+            self._logger.error("Writing metrics failed: {}".format(err),
+                               extra=self._extra)
 
-        info = "Next Transfer will be started at: {}".format(
-            self._next_transfer)
+    def _transfer_cycle(self):
+        """
+        Transfer the new data, if any. Return True if new data were
+        transferred without failures.
+        """
+        if self.has_newData() is False:
+            return False
+        if self._start_transfer() is False:
+            return False
+        self._watcher.commit()
+        return True
 
-        self._logger.info(info, extra=self._extra)
+    async def _run_cycle(self):
+        async with self._cycle_lock:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(None, self._transfer_cycle)
 
-        self._scheduler.enterabs(time.mktime(self._next_transfer.timetuple()),
-                                 priority=0,
-                                 action=self._rescheduler,
-                                 argument=())
+    async def _fixed_time_task(self):
+        """
+        Run a Transfer at the fixed time and then every delta_time_hours.
+        """
+        while True:
+            info = "Next Transfer will be started at: {}".format(
+                self._next_transfer)
+            self._logger.info(info, extra=self._extra)
+
+            delay = (self._next_transfer - datetime.now()).total_seconds()
+            await asyncio.sleep(max(delay, 0))
+
+            self._next_transfer += timedelta(hours=self._delta_time_hours)
+            try:
+                await self._run_cycle()
+            except Exception as err:
+                self._logger.error("Transfer failed: {}".format(err),
+                                   extra=self._extra)
+
+    async def _poll_task(self):
+        """
+        Poll the Pipeline Data Base for new data, starting a Transfer as
+        soon as they appear. The interval doubles, up to max_poll_seconds,
+        while there is nothing new or the Transfer fails.
+        """
+        interval = self._poll_seconds
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                transferred = await self._run_cycle()
+            except Exception as err:
+                self._logger.error("Polling failed: {}".format(err),
+                                   extra=self._extra)
+                transferred = False
+
+            if transferred is True:
+                interval = self._poll_seconds
+            else:
+                interval = min(interval * 2, self._max_poll_seconds)
 
     def _set_time(self, hours, minutes):
         """
         Set the start time of the Transfer process.
         """
         current_time = datetime.now()
-        set_time = current_time.replace(hour=hours, minute=minutes)
-        delta_time = set_time - current_time
-        if delta_time.total_seconds() < 0:
-            next_time = current_time + timedelta(hours=12)
-            next_time = next_time.replace(hour=hours, minute=minutes)
-        else:
-            next_time = set_time
+        next_time = current_time.replace(hour=hours, minute=minutes,
+                                         second=0, microsecond=0)
+        if next_time < current_time:
+            next_time += timedelta(days=1)
 
         self._next_transfer = next_time
-        info = "Next Transfer will be started at: {}".format(
-            self._next_transfer)
-
-        self._logger.info(info, extra=self._extra)
 
-        self._scheduler.enterabs(time.mktime(next_time.timetuple()),
-                                 priority=0,
-                                 action=self._rescheduler,
-                                 argument=())
+    async def _serve(self, hours, minutes):
+        self._cycle_lock = asyncio.Lock()
+        self._set_time(hours, minutes)
+        await asyncio.gather(self._fixed_time_task(), self._poll_task())
 
     def run(self, hours, minutes):
         """
-        Start the scheduler to run the Transfer in autonomous mode.
+        Start the bot to run the Transfer in autonomous mode: the Transfer
+        starts as soon as new data are found by polling the Pipeline
+        Data Base, and also at a fixed time every delta_time_hours.
         input:
             hours: the hour of firts Transfer start
             minutes: the minutes of firts Transfer start
         """
-        self._set_time(hours, minutes)
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        task = loop.create_task(self._serve(hours, minutes))
         try:
-            self._scheduler.run()
+            loop.run_until_complete(task)
         except KeyboardInterrupt:
             self._logger.info("Stopping the Bot.", extra=self._extra)
+            task.cancel()
+            try:
+                loop.run_until_complete(task)
+            except asyncio.CancelledError:
+                pass
+        finally:
+            loop.close()
 
 
 if __name__ == "__main__":
@@ -175,7 +303,7 @@ if __name__ == "__main__":
                         type=str,
                         default='')
 
-    TINFO = "Time interval, in hours, for the next data Transfer"
+    TINFO = "Time interval, in hours, for the next fixed time data Transfer"
 
     PARSER.add_argument("-t",
                         help=TINFO,
@@ -192,9 +320,27 @@ if __name__ == "__main__":
                         type=int,
                         default=0)
 
+    PARSER.add_argument("-p",
+                        help="Interval, in seconds, between searches for "
+                        "new data",
+                        type=int,
+                        default=TRANSFER_POLL_SECONDS)
+
+    PARSER.add_argument("-d",
+                        help="Destination directory of the Transfers, an "
+                        "absolute path. default config.TRANSFER_DEST_ROOT",
+                        type=str,
+                        default=TRANSFER_DEST_ROOT)
+
     ARGS = PARSER.parse_args()
 
+    if not ARGS.d or not os.path.isabs(ARGS.d):
+        PARSER.error("Set the destination directory of the Transfers, an "
+                     "absolute path, with -d or config.TRANSFER_DEST_ROOT")
+
     BOT = Autotransferbot(user=ARGS.u,
                           useremail=ARGS.e,
-                          delta_time_hours=ARGS.t)
+                          delta_time_hours=ARGS.t,
+                          poll_seconds=ARGS.p,
+                          dest_dir=ARGS.d)
     BOT.run(ARGS.s, ARGS.m)
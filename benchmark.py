@@ -0,0 +1,355 @@
+#!/usr/bin/env python
+# -*- Coding: UTF-8 -*-
+"""
+Benchmark of the Pipeline Data Base helpers on a synthetic SQLite copy of
+the Pipeline Data Base, with the schema of model.py and N tiles x 12
+filters x M exposures, so the helpers can be timed without the live
+MySQL server.
+"""
+from collections import OrderedDict
+from contextlib import redirect_stdout
+from datetime import date, datetime, time as dtime, timedelta
+import io
+import os
+import sqlite3
+import tempfile
+import time
+import warnings
+
+import numpy as np
+from astropy.io import fits
+from astropy.io.fits.verify import VerifyWarning
+from pydal import DAL
+
+from config import FILTERS, JYPE_VERSION, TILES_VERSION
+import lookupcache
+from model import TABLES, db, db_read
+import searchimages
+import t80s_header_data
+import tiledepth
+import tileinfo
+
+__AUTHOR = "E. S. Pereira"
+__DATE = "18/10/2026"
+__EMAIL = "pereira.somoza@gmail.com"
+
+
+SQLITE_TYPES = {"id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+                "string": "VARCHAR(512)",
+                "char": "CHAR(512)",
+                "text": "TEXT",
+                "tinytext": "TEXT",
+                "integer": "INTEGER",
+                "smallint": "INTEGER",
+                "mediumint": "INTEGER",
+                "bigint": "INTEGER",
+                "bit": "INTEGER",
+                "float": "REAL",
+                "double": "REAL",
+                "decimal": "REAL",
+                "date": "DATE",
+                "time": "TIME",
+                "datetime": "TIMESTAMP",
+                "timestamp": "TIMESTAMP",
+                "binary": "BLOB"}
+
+# Indexes of the columns used by the helpers to join and filter.
+FIXTURE_INDEXES = (("t80tiles", "PName"),
+                   ("t80tilesinfo", "Tile_ID"),
+                   ("t80tilesinfo", "Filter_ID"),
+                   ("t80tileImgs", "Tile_ID"),
+                   ("rc", "ori_id"),
+                   ("t80oa", "Date"),
+                   ("calib_zp_tiles", "id_tilesinfo"))
+
+FRAMETYPES = ("BIAS", "FLAT", "SCI")
+FIRST_NIGHT = date(2017, 1, 1)
+BIAS_PER_NIGHT = 5
+
+
+def create_schema(connection):
+    """
+    Create the tables of model.py in a sqlite3 connection.
+    """
+    dal = DAL(None)
+    for name, define in TABLES.items():
+        define(dal, False)
+        columns = ['"{0}" {1}'.format(field.name, SQLITE_TYPES[field.type])
+                   for field in dal[name]]
+        connection.execute('CREATE TABLE "{0}" ({1})'.format(
+            name, ", ".join(columns)))
+    for table, column in FIXTURE_INDEXES:
+        connection.execute('CREATE INDEX "{0}_{1}" ON "{0}" ("{1}")'.format(
+            table, column))
+
+
+def _sql_value(value):
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, (date, dtime)):
+        return value.isoformat()
+    return value
+
+
+def _insert(connection, table, rows):
+    if not rows:
+        return
+    columns = list(rows[0])
+    connection.executemany('INSERT INTO "{0}" ({1}) VALUES ({2})'.format(
+        table,
+        ", ".join('"{0}"'.format(column) for column in columns),
+        ", ".join("?" * len(columns))),
+        [[_sql_value(row[column]) for column in columns] for row in rows])
+
+
+def build_fixture(path, ntiles, nexposures=3, seed=0):
+    """
+    Write to path a SQLite Data Base with ntiles tiles, each one with the
+    12 filters of config.FILTERS and nexposures exposures by filter.
+    """
+    if os.path.isfile(path):
+        os.remove(path)
+    rng = np.random.RandomState(seed)
+    connection = sqlite3.connect(path)
+    create_schema(connection)
+
+    _insert(connection, "filter", [{"id": i + 1, "Name": name}
+                                   for i, name in enumerate(FILTERS)])
+    _insert(connection, "frametype", [{"id": i + 1, "Name": name}
+                                      for i, name in enumerate(FRAMETYPES)])
+    sci_id = FRAMETYPES.index("SCI") + 1
+    bias_id = FRAMETYPES.index("BIAS") + 1
+
+    tiles = []
+    tilesinfo = []
+    zps = []
+    oas = []
+    rcs = []
+    tile_imgs = []
+    for tile_id in range(1, ntiles + 1):
+        ra, dec = rng.uniform(0, 360), rng.uniform(-80, 10)
+        tiles.append({"id": tile_id,
+                      "PName": "BENCH_{0:05d}".format(tile_id),
+                      "RA": ra,
+                      "DEC": dec,
+                      "PIXEL_SCALE": 0.55,
+                      "IMAGE_SIZE": 11000})
+        for filter_id in range(1, len(FILTERS) + 1):
+            info_id = len(tilesinfo) + 1
+            tilesinfo.append({"id": info_id,
+                              "Tile_ID": tile_id,
+                              "Filter_ID": filter_id,
+                              "RefImage_ID": len(oas) + 1,
+                              "UPDATEDATE_tile": datetime(2017, 6, 1),
+                              "Noise": rng.uniform(1, 5),
+                              "FWHM_Mean": rng.uniform(1, 2),
+                              "FWHM_Min": 0.9,
+                              "FWHM_Max": 2.5,
+                              "MoffatBeta_Mean": rng.uniform(2, 4),
+                              "CRPIX1": 5500.5,
+                              "CRVAL1": ra,
+                              "CRPIX2": 5500.5,
+                              "CRVAL2": dec,
+                              "CD1_1": -0.55 / 3600,
+                              "CD1_2": 0.0,
+                              "CD2_1": 0.0,
+                              "CD2_2": 0.55 / 3600})
+            zps.append({"id_tilesinfo": info_id,
+                        "zp": rng.uniform(20, 22),
+                        "err_zp": 0.01,
+                        "calib_procedure": 1})
+            for _ in range(nexposures):
+                oa_id = len(oas) + 1
+                night = FIRST_NIGHT + timedelta(days=int(rng.randint(365)))
+                oas.append({"id": oa_id,
+                            "Name": "bench_{0:08d}.fz".format(oa_id),
+                            "Date": night,
+                            "Time": dtime(int(rng.randint(24)),
+                                          int(rng.randint(60)),
+                                          int(rng.randint(60))),
+                            "ImageType_ID": sci_id,
+                            "Filter_ID": filter_id,
+                            "RA": ra + rng.normal(0, 0.1),
+                            "DEC": dec + rng.normal(0, 0.1),
+                            "ExpTime": 60.0,
+                            "UPDATEDATE_OA": datetime(2017, 6, 1)})
+                rcs.append({"id": oa_id, "ori_id": oa_id})
+                tile_imgs.append({"Tile_ID": tile_id, "RC_ID": oa_id})
+
+    for day in range(365):
+        for _ in range(BIAS_PER_NIGHT):
+            oa_id = len(oas) + 1
+            oas.append({"id": oa_id,
+                        "Name": "bench_{0:08d}.fz".format(oa_id),
+                        "Date": FIRST_NIGHT + timedelta(days=day),
+                        "Time": dtime(20, 0, 0),
+                        "ImageType_ID": bias_id,
+                        "Filter_ID": None,
+                        "RA": None,
+                        "DEC": None,
+                        "ExpTime": 0.0,
+                        "UPDATEDATE_OA": datetime(2017, 6, 1)})
+
+    for table, rows in (("t80tiles", tiles),
+                        ("t80tilesinfo", tilesinfo),
+                        ("calib_zp_tiles", zps),
+                        ("t80oa", oas),
+                        ("rc", rcs),
+                        ("t80tileImgs", tile_imgs)):
+        _insert(connection, table, rows)
+    connection.commit()
+    connection.close()
+
+
+def use_fixture(path):
+    """
+    Point model.db and model.db_read to a SQLite fixture.
+    """
+    for proxy in (db,) if db_read is db else (db, db_read):
+        proxy.set_uri("sqlite://" + os.path.abspath(path),
+                      check_reserved=False)
+    lookupcache.invalidate_all()
+
+
+def write_images(path_root, pnames, filetype="fits"):
+    """
+    Write a small image for each filter of the tiles, in the directories
+    searched by t80s_header_data. The fz images are tile compressed, as
+    the _swp.fz tiles: an empty primary HDU and the compressed image.
+    """
+    data = np.zeros((16, 16), dtype=np.float32)
+    for pname in pnames:
+        for filt in FILTERS:
+            img_dir = "{0}/{1}/tiles/{2}/{3}/{4}".format(path_root,
+                                                         JYPE_VERSION,
+                                                         TILES_VERSION,
+                                                         pname, filt)
+            os.makedirs(img_dir, exist_ok=True)
+            hdul = fits.HDUList([fits.PrimaryHDU(data)])
+            if filetype == "fz":
+                hdul = fits.HDUList([fits.PrimaryHDU(),
+                                     fits.CompImageHDU(data)])
+            hdul.writeto("{0}/{1}_{2}_swp.{3}".format(img_dir, pname, filt,
+                                                      filetype),
+                         overwrite=True)
+
+
+def _timeit(func, args_list, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.time()
+        for args in args_list:
+            func(*args)
+        elapsed = (time.time() - start) / len(args_list)
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _depths():
+    return tiledepth.get_depths(tileinfo.get_tiles_info())
+
+
+def _header_data(pname):
+    with redirect_stdout(io.StringIO()), warnings.catch_warnings():
+        warnings.simplefilter("ignore", VerifyWarning)
+        t80s_header_data.t80s_header_data(pname, "fits")
+
+
+def benchmarks(pnames):
+    """
+    Return an OrderedDict name: (function, list of args) of the
+    benchmarks over the tiles pnames.
+    """
+    start, end = FIRST_NIGHT, FIRST_NIGHT + timedelta(days=30)
+    by_tile = [(pname, "R") for pname in pnames]
+    return OrderedDict(
+        [("get_mjd_for_tiling", (tileinfo.get_mjd_for_tiling, by_tile)),
+         ("tile_info", (tileinfo.tile_info, by_tile)),
+         ("get_depth2fwhm5s", (tileinfo.get_depth2fwhm5s, by_tile)),
+         ("get_depth3arc5s", (tileinfo.get_depth3arc5s, by_tile)),
+         ("get_deptharcsec2", (tileinfo.get_deptharcsec2, by_tile)),
+         ("tiledepth.get_depths", (_depths, [()])),
+         ("search_images", (searchimages.search_images,
+                            [(start, end, "SCI", "R")])),
+         ("search_images BIAS", (searchimages.search_images,
+                                 [(start, end, "BIAS")])),
+         ("count_images", (searchimages.count_images,
+                           [(start, end, "SCI", "R")])),
+         ("t80s_header_data", (_header_data, [(pname,)
+                                              for pname in pnames]))])
+
+
+def run(scales, nexposures=3, sample=10, repeat=3, work_dir=None):
+    """
+    Build a fixture for each number of tiles in scales and time the
+    benchmarks on sample of its tiles, keeping the best of repeat runs.
+    Return a list of (ntiles, name, seconds per call).
+    """
+    work_dir = work_dir or tempfile.mkdtemp(prefix="autotransfer_bench_")
+    path_root = t80s_header_data.PATH_ROOT
+    results = []
+    try:
+        t80s_header_data.PATH_ROOT = os.path.join(work_dir, "images")
+        for ntiles in scales:
+            path = os.path.join(work_dir, "bench_{0}.sqlite".format(ntiles))
+            build_fixture(path, ntiles, nexposures)
+            use_fixture(path)
+            pnames = ["BENCH_{0:05d}".format(i + 1)
+                      for i in range(min(sample, ntiles))]
+            write_images(t80s_header_data.PATH_ROOT, pnames)
+            for name, (func, args_list) in benchmarks(pnames).items():
+                try:
+                    seconds = _timeit(func, args_list, repeat)
+                except Exception as err:
+                    print("{0} failed: {1}: {2}".format(name,
+                                                        type(err).__name__,
+                                                        err))
+                    seconds = None
+                results.append((ntiles, name, seconds))
+    finally:
+        t80s_header_data.PATH_ROOT = path_root
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    DESCRIPTION = '''Benchmark the Pipeline Data Base helpers on synthetic
+    SQLite Data Bases of several sizes.
+    '''
+    PARSER = argparse.ArgumentParser(
+        description=DESCRIPTION)
+
+    PARSER.add_argument("-n",
+                        help="Comma separated numbers of tiles. "
+                        "default 10,100,1000",
+                        type=str,
+                        default="10,100,1000")
+
+    PARSER.add_argument("-e",
+                        help="Exposures by tile and filter. default 3",
+                        type=int,
+                        default=3)
+
+    PARSER.add_argument("-s",
+                        help="Number of tiles timed. default 10",
+                        type=int,
+                        default=10)
+
+    PARSER.add_argument("-r",
+                        help="Repetitions, the best is kept. default 3",
+                        type=int,
+                        default=3)
+
+    PARSER.add_argument("-d",
+                        help="Directory of the fixtures. default a "
+                        "temporary directory",
+                        type=str,
+                        default=None)
+
+    ARGS = PARSER.parse_args()
+
+    SCALES = [int(ntiles) for ntiles in ARGS.n.split(",")]
+    print("{0:>8} {1:<24} {2:>12}".format("tiles", "benchmark", "ms/call"))
+    for NTILES, NAME, SECONDS in run(SCALES, ARGS.e, ARGS.s, ARGS.r, ARGS.d):
+        MS = "failed" if SECONDS is None else "{0:.3f}".format(SECONDS * 1e3)
+        print("{0:>8} {1:<24} {2:>12}".format(NTILES, NAME, MS))
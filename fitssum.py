@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- Coding: UTF-8 -*-
+"""
+Incremental computation of the FITS DATASUM and CHECKSUM of every HDU of
+a file, fed with consecutive chunks of its bytes.
+"""
+import numpy as np
+
+__AUTHOR = "E. S. Pereira"
+__DATE = "18/10/2026"
+__EMAIL = "pereira.somoza@gmail.com"
+
+
+BLOCK_SIZE = 2880
+CARD_SIZE = 80
+
+
+def _sum32(buf):
+    """
+    Return the (unfolded) sum of the big-endian 32 bits words of buf.
+    """
+    return int(np.frombuffer(buf, dtype='>u4').sum(dtype=np.uint64))
+
+
+def fold(value):
+    """
+    Return the 32 bits ones' complement of a sum (end around carry).
+    """
+    while value >> 32:
+        value = (value & 0xFFFFFFFF) + (value >> 32)
+    return value
+
+
+class HDUSum(object):
+    """
+    Sums of one HDU.
+    Attr:
+        cards: Structural keywords and the CHECKSUM and DATASUM cards
+        datasum: Ones' complement sum of the data
+        hdusum: Ones' complement sum of header and data
+    """
+
+    def __init__(self):
+        self.cards = {}
+        self.datasum = 0
+        self.hdusum = 0
+        self.data_size = None
+
+    @property
+    def checksum_ok(self):
+        """
+        Verify if the CHECKSUM card matches the content of the HDU.
+        """
+        return 'CHECKSUM' in self.cards and fold(self.hdusum) == 0xFFFFFFFF
+
+    @property
+    def datasum_ok(self):
+        """
+        Verify if the DATASUM card matches the data of the HDU.
+        """
+        datasum = self.cards.get('DATASUM')
+        return datasum is not None and \
+            datasum.isdigit() and int(datasum) == fold(self.datasum)
+
+    def parse_block(self, block):
+        """
+        Parse the cards of a header block. Return True at the END card.
+        """
+        for pos in range(0, BLOCK_SIZE, CARD_SIZE):
+            card = block[pos:pos + CARD_SIZE].decode('ascii', 'replace')
+            key = card[:8].strip()
+            if key == 'END':
+                self.data_size = self._data_size()
+                return True
+            if card[8:10] == '= ':
+                value = card[10:].split('/')[0].strip().strip("'").strip()
+                self.cards[key] = value
+        return False
+
+    def _data_size(self):
+        naxis = int(self.cards.get('NAXIS', 0))
+        if naxis == 0:
+            return 0
+        npix = 1
+        for i in range(1, naxis + 1):
+            npix *= int(self.cards.get('NAXIS{0}'.format(i), 0))
+        if 'XTENSION' in self.cards and self.cards.get('NAXIS1') is not None:
+            pcount = int(self.cards.get('PCOUNT', 0))
+            gcount = int(self.cards.get('GCOUNT', 1))
+        else:
+            pcount = 0
+            gcount = 1
+        nbytes = abs(int(self.cards['BITPIX'])) // 8 * gcount * (pcount + npix)
+        return -(-nbytes // BLOCK_SIZE) * BLOCK_SIZE
+
+
+class FitsSum(object):
+    """
+    Compute the sums of all HDU of a FITS file from consecutive chunks.
+    Usage:
+        summer = FitsSum()
+        for chunk in chunks:
+            summer.update(chunk)
+        summer.matches(datasum, checksum)
+    """
+
+    def __init__(self):
+        self.hdus = []
+        self._hdu = None
+        self._data_left = 0
+        self._buffer = b''
+
+    def update(self, chunk):
+        """
+        Add the next chunk of bytes of the file.
+        """
+        if self._buffer:
+            chunk = self._buffer + bytes(chunk)
+        view = memoryview(chunk)
+        pos = 0
+        size = len(view)
+        while pos < size:
+            if self._hdu is None or self._data_left == 0:
+                # Reading a header, one block at a time.
+                if size - pos < BLOCK_SIZE:
+                    break
+                if self._hdu is None:
+                    self._hdu = HDUSum()
+                    self.hdus.append(self._hdu)
+                block = view[pos:pos + BLOCK_SIZE]
+                pos += BLOCK_SIZE
+                self._hdu.hdusum += _sum32(block)
+                if self._hdu.parse_block(bytes(block)):
+                    self._data_left = self._hdu.data_size
+                    if self._data_left == 0:
+                        self._hdu = None
+            else:
+                nbytes = min(self._data_left, size - pos)
+                nbytes -= nbytes % 4
+                if nbytes == 0:
+                    break
+                data_sum = _sum32(view[pos:pos + nbytes])
+                self._hdu.datasum += data_sum
+                self._hdu.hdusum += data_sum
+                pos += nbytes
+                self._data_left -= nbytes
+                if self._data_left == 0:
+                    self._hdu = None
+        self._buffer = bytes(view[pos:])
+
+    @property
+    def complete(self):
+        """
+        Verify if all bytes fed belong to complete HDUs.
+        """
+        return self._hdu is None and len(self._buffer) == 0 and \
+            len(self.hdus) > 0
+
+    def datasums(self):
+        """
+        Return the DATASUM computed for each HDU.
+        """
+        return [fold(hdu.datasum) for hdu in self.hdus]
+
+    def matches(self, datasum=None, checksum=None):
+        """
+        Verify if an HDU has the given DATASUM and an HDU has the given
+        CHECKSUM card with content matching it. None values are not
+        verified.
+        """
+        if datasum is not None and \
+                int(datasum) not in self.datasums():
+            return False
+        if checksum is not None and \
+                not any(hdu.cards.get('CHECKSUM') == checksum and
+                        hdu.checksum_ok for hdu in self.hdus):
+            return False
+        return True
+
+
+def file_sums(path, chunk_size=BLOCK_SIZE * 1024):
+    """
+    Return the FitsSum of a file.
+    """
+    summer = FitsSum()
+    with open(path, 'rb') as fits_file:
+        while True:
+            chunk = fits_file.read(chunk_size)
+            if not chunk:
+                break
+            summer.update(chunk)
+    return summer
@@ -0,0 +1,408 @@
+#!/usr/bin/env python
+# -*- Coding: UTF-8 -*-
+"""
+Vectorized HEALPix pixelization in NumPy (ring and nested schemes), with
+the disc and box queries used by the spatial searches, so healpy is not
+needed. The formulas follow the HEALPix C++ library (Gorski et al. 2005).
+Run as a script, the disc queries are checked against healpy.
+"""
+import numpy as np
+
+__AUTHOR = "E. S. Pereira"
+__DATE = "18/10/2026"
+__EMAIL = "pereira.somoza@gmail.com"
+
+
+# Upper bound of the pixel radius (largest distance from the center to
+# the border of a pixel) in units of the pixel resolution; it tends to
+# 1.0446 as nside grows.
+PIXRAD_FACTOR = 1.05
+
+# Maximum number of points sampled at once by disc_pixels.
+DISC_POINTS = 2 ** 18
+
+# Row and column of the base pixels, to convert nested pixels to angles.
+_JRLL = np.array([2, 2, 2, 2, 3, 3, 3, 3, 4, 4, 4, 4])
+_JPLL = np.array([1, 3, 5, 7, 0, 2, 4, 6, 1, 3, 5, 7])
+
+
+def nside2npix(nside):
+    '''
+    Return the number of pixels of a map of nside.
+    '''
+    return 12 * nside * nside
+
+
+def nside2resol(nside):
+    '''
+    Return the resolution (square root of the pixel area) of nside, in
+    degrees.
+    '''
+    return np.degrees(np.sqrt(4 * np.pi / nside2npix(nside)))
+
+
+def _spread_bits(values):
+    values = values.astype(np.int64)
+    values = (values | (values << 16)) & 0x0000FFFF0000FFFF
+    values = (values | (values << 8)) & 0x00FF00FF00FF00FF
+    values = (values | (values << 4)) & 0x0F0F0F0F0F0F0F0F
+    values = (values | (values << 2)) & 0x3333333333333333
+    return (values | (values << 1)) & 0x5555555555555555
+
+
+def _compress_bits(values):
+    values = values.astype(np.int64) & 0x5555555555555555
+    values = (values | (values >> 1)) & 0x3333333333333333
+    values = (values | (values >> 2)) & 0x0F0F0F0F0F0F0F0F
+    values = (values | (values >> 4)) & 0x00FF00FF00FF00FF
+    values = (values | (values >> 8)) & 0x0000FFFF0000FFFF
+    return (values | (values >> 16)) & 0x00000000FFFFFFFF
+
+
+def ang2pix(nside, ra, dec, nest=True):
+    '''
+    Return the pixels of the points (ra, dec), in degrees.
+    '''
+    ra = np.atleast_1d(np.asarray(ra, dtype=float))
+    dec = np.atleast_1d(np.asarray(dec, dtype=float))
+    z = np.sin(np.radians(dec))
+    za = np.abs(z)
+    tt = np.mod(np.radians(ra), 2 * np.pi) / (0.5 * np.pi)
+    tt = np.where(tt >= 4, 0, tt)
+    pix = np.zeros(z.shape, dtype=np.int64)
+
+    equator = za <= 2.0 / 3
+    temp1 = nside * (0.5 + tt[equator])
+    temp2 = nside * z[equator] * 0.75
+    jp = (temp1 - temp2).astype(np.int64)
+    jm = (temp1 + temp2).astype(np.int64)
+    if nest:
+        ifp = jp // nside
+        ifm = jm // nside
+        face = np.where(ifp == ifm, ifp | 4,
+                        np.where(ifp < ifm, ifp, ifm + 8))
+        ix = jm & (nside - 1)
+        iy = nside - (jp & (nside - 1)) - 1
+        pix[equator] = (face * nside * nside + _spread_bits(ix) +
+                        (_spread_bits(iy) << 1))
+    else:
+        iring = nside + 1 + jp - jm
+        kshift = 1 - (iring & 1)
+        iphi = ((jp + jm - nside + kshift + 1) // 2) % (4 * nside)
+        pix[equator] = 2 * nside * (nside - 1) + (iring - 1) * 4 * nside + \
+            iphi
+
+    cap = ~equator
+    ntt = np.minimum(tt[cap].astype(np.int64), 3)
+    tp = tt[cap] - ntt
+    tmp = nside * np.sqrt(3 * (1 - za[cap]))
+    jp = (tp * tmp).astype(np.int64)
+    jm = ((1 - tp) * tmp).astype(np.int64)
+    north = z[cap] > 0
+    if nest:
+        jp = np.minimum(jp, nside - 1)
+        jm = np.minimum(jm, nside - 1)
+        ix = np.where(north, nside - jm - 1, jp)
+        iy = np.where(north, nside - jp - 1, jm)
+        face = np.where(north, ntt, ntt + 8)
+        pix[cap] = (face * nside * nside + _spread_bits(ix) +
+                    (_spread_bits(iy) << 1))
+    else:
+        iring = jp + jm + 1
+        iphi = np.minimum((tt[cap] * iring).astype(np.int64), 4 * iring - 1)
+        pix[cap] = np.where(north, 2 * iring * (iring - 1) + iphi,
+                            nside2npix(nside) - 2 * iring * (iring + 1) +
+                            iphi)
+    return pix
+
+
+def pix2ang(nside, pix, nest=True):
+    '''
+    Return the (ra, dec), in degrees, of the centers of pixels.
+    '''
+    pix = np.atleast_1d(np.asarray(pix, dtype=np.int64))
+    npix = nside2npix(nside)
+    fact2 = 4.0 / npix
+    fact1 = 2 * nside * fact2
+
+    if nest:
+        face = pix // (nside * nside)
+        ipf = pix % (nside * nside)
+        ix = _compress_bits(ipf)
+        iy = _compress_bits(ipf >> 1)
+        jr = (_JRLL[face] * nside) - ix - iy - 1
+
+        nr = np.where(jr < nside, jr,
+                      np.where(jr > 3 * nside, 4 * nside - jr, nside))
+        z = np.where(jr < nside, 1 - nr * nr * fact2,
+                     np.where(jr > 3 * nside, nr * nr * fact2 - 1,
+                              (2 * nside - jr) * fact1))
+        tmp = _JPLL[face] * nr + ix - iy
+        tmp = np.where(tmp < 0, tmp + 8 * nr, tmp)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            phi = np.where(nr == nside, 0.75 * 0.5 * np.pi * tmp * fact1,
+                           0.5 * 0.5 * np.pi * tmp / nr)
+    else:
+        ncap = 2 * nside * (nside - 1)
+        z = np.zeros(pix.shape)
+        phi = np.zeros(pix.shape)
+
+        north = pix < ncap
+        iring = (1 + np.sqrt(1 + 2 * pix[north]).astype(np.int64)) >> 1
+        iphi = pix[north] + 1 - 2 * iring * (iring - 1)
+        z[north] = 1 - iring * iring * fact2
+        phi[north] = (iphi - 0.5) * 0.5 * np.pi / iring
+
+        equator = (pix >= ncap) & (pix < npix - ncap)
+        ip = pix[equator] - ncap
+        iring = ip // (4 * nside) + nside
+        iphi = ip % (4 * nside) + 1
+        fodd = np.where((iring + nside) & 1, 1.0, 0.5)
+        z[equator] = (2 * nside - iring) * fact1
+        phi[equator] = (iphi - fodd) * np.pi * 0.75 * fact1
+
+        south = pix >= npix - ncap
+        ip = npix - pix[south]
+        iring = (1 + np.sqrt(2 * ip - 1).astype(np.int64)) >> 1
+        iphi = 4 * iring + 1 - (ip - 2 * iring * (iring - 1))
+        z[south] = iring * iring * fact2 - 1
+        phi[south] = (iphi - 0.5) * 0.5 * np.pi / iring
+
+    return np.degrees(phi), np.degrees(np.arcsin(np.clip(z, -1, 1)))
+
+
+def angular_distance(ra1, dec1, ra2, dec2):
+    '''
+    Return the angular distance, in degrees, between points in degrees.
+    '''
+    ra1, dec1, ra2, dec2 = [np.radians(val)
+                            for val in (ra1, dec1, ra2, dec2)]
+    sin_ddec = np.sin((dec2 - dec1) / 2)
+    sin_dra = np.sin((ra2 - ra1) / 2)
+    hav = sin_ddec ** 2 + np.cos(dec1) * np.cos(dec2) * sin_dra ** 2
+    return np.degrees(2 * np.arcsin(np.sqrt(np.clip(hav, 0, 1))))
+
+
+def _disc_offsets(radius, step):
+    '''
+    Return the distances and position angles, in radians, of a grid of
+    spacing step, in degrees, filling a disc of radius.
+    '''
+    radius_rad = np.radians(radius)
+    nstep = int(np.ceil(radius / step))
+    offsets = np.linspace(-radius_rad, radius_rad, 2 * nstep + 1)
+    x, y = np.meshgrid(offsets, offsets)
+    rho = np.hypot(x, y).ravel()
+    keep = rho <= radius_rad
+    return rho[keep], np.arctan2(y.ravel()[keep], x.ravel()[keep])
+
+
+def disc_points(ra, dec, radius, step):
+    '''
+    Return points, in degrees, filling a disc with spacing step. For
+    arrays of centers of shape (N, 1) the points have shape (N, S).
+    The points are built as unit vectors from the center and its north
+    and east directions, so a disc around a pole is filled as well.
+    '''
+    rho, angle = _disc_offsets(radius, step)
+    north = np.sin(rho) * np.sin(angle)
+    east = np.sin(rho) * np.cos(angle)
+    up = np.cos(rho)
+
+    ra0, dec0 = np.radians(ra), np.radians(dec)
+    cos_ra, sin_ra = np.cos(ra0), np.sin(ra0)
+    cos_dec, sin_dec = np.cos(dec0), np.sin(dec0)
+    x = (up * cos_dec - north * sin_dec) * cos_ra - east * sin_ra
+    y = (up * cos_dec - north * sin_dec) * sin_ra + east * cos_ra
+    z = up * sin_dec + north * cos_dec
+    return (np.degrees(np.arctan2(y, x)) % 360,
+            np.degrees(np.arcsin(np.clip(z, -1, 1))))
+
+
+def query_disc(nside, ra, dec, radius, nest=True):
+    '''
+    Return the sorted pixels overlapping a disc of radius, all in degrees.
+    The disc is sampled at a quarter of the pixel resolution and the
+    candidates kept when their center is closer than radius plus the
+    pixel radius, so a few pixels only near the disc may be included.
+    '''
+    resol = nside2resol(nside)
+    margin = PIXRAD_FACTOR * resol
+    ra_pts, dec_pts = disc_points(ra, dec, radius + margin, resol / 4)
+    pixels = np.unique(ang2pix(nside, ra_pts, dec_pts, nest))
+    ra_pix, dec_pix = pix2ang(nside, pixels, nest)
+    return pixels[angular_distance(ra, dec, ra_pix, dec_pix) <=
+                  radius + margin]
+
+
+def box_distance(ra, dec, ra_min, ra_max, dec_min, dec_max):
+    '''
+    Return the angular distance, in degrees, from points to a box in RA
+    and DEC, 0 inside. If ra_min > ra_max the box crosses RA = 0.
+    '''
+    ra = np.asarray(ra, dtype=float)
+    dec = np.asarray(dec, dtype=float)
+    width = (ra_max - ra_min) % 360 or (360.0 if ra_max != ra_min else 0)
+
+    # Between the RA edges the closest point is on the same meridian.
+    inside_ra = (ra - ra_min) % 360 <= width
+    distance = np.maximum(np.maximum(dec_min - dec, dec - dec_max), 0.0)
+
+    # Otherwise it is on an RA edge, the closest point of its meridian
+    # clipped to the DEC range.
+    edges = []
+    for ra_edge in (ra_min, ra_min + width):
+        closest = np.degrees(np.arctan2(np.sin(np.radians(dec)),
+                                        np.cos(np.radians(dec)) *
+                                        np.cos(np.radians(ra - ra_edge))))
+        edges.append(angular_distance(ra, dec, ra_edge,
+                                      np.clip(closest, dec_min, dec_max)))
+    return np.where(inside_ra, distance, np.minimum(*edges))
+
+
+def query_box(nside, ra_min, ra_max, dec_min, dec_max, nest=True):
+    '''
+    Return the sorted pixels overlapping a box in RA and DEC, in degrees.
+    If ra_min > ra_max the box crosses RA = 0. The candidates are kept
+    when their center is closer to the box than the pixel radius.
+    '''
+    resol = nside2resol(nside)
+    margin = PIXRAD_FACTOR * resol
+    dec_lo = max(dec_min - margin, -90.0)
+    dec_hi = min(dec_max + margin, 90.0)
+    width = (ra_max - ra_min) % 360 or (360.0 if ra_max != ra_min else 0)
+
+    # The RA step keeps the spacing on the sky where the parallels are the
+    # longest; the RA margin of each row covers a pixel up to the margin
+    # towards the pole.
+    if dec_lo <= 0 <= dec_hi:
+        widest = 0.0
+    else:
+        widest = min(abs(dec_lo), abs(dec_hi))
+    ra_step = resol / 4 / np.cos(np.radians(widest))
+
+    decs = np.append(np.arange(dec_lo, dec_hi, resol / 4), dec_hi)
+    cos_far = np.cos(np.radians(np.minimum(np.abs(decs) + margin, 90.0)))
+    ra_margins = np.minimum(margin / np.maximum(cos_far, 1e-6), 180.0)
+    ra_pts, dec_pts = [], []
+    for dec, ra_margin in zip(decs, ra_margins):
+        ras = np.append(np.arange(-ra_margin, width + ra_margin, ra_step),
+                        width + ra_margin)
+        ra_pts.append((ra_min + ras) % 360)
+        dec_pts.append(np.full(len(ras), dec))
+    pixels = np.unique(ang2pix(nside, np.concatenate(ra_pts),
+                               np.concatenate(dec_pts), nest))
+
+    ra_pix, dec_pix = pix2ang(nside, pixels, nest)
+    return pixels[box_distance(ra_pix, dec_pix, ra_min, ra_max, dec_min,
+                               dec_max) <= margin]
+
+
+def disc_pixels(nside, ra, dec, radius):
+    '''
+    Return the pairs (position indices, pixels) of the nested pixels of
+    nside overlapping the discs of radius, in degrees, around arrays of
+    positions, sorted by position and pixel. The discs are sampled for
+    chunks of positions, with at most DISC_POINTS points at once.
+    '''
+    ra = np.atleast_1d(np.asarray(ra, dtype=float))
+    dec = np.atleast_1d(np.asarray(dec, dtype=float))
+    resol = nside2resol(nside)
+    margin = PIXRAD_FACTOR * resol
+    npoints = len(_disc_offsets(radius + margin, resol / 4)[0])
+    chunk = max(DISC_POINTS // npoints, 1)
+
+    positions, pixels = [np.zeros(0, dtype=np.int64)], \
+        [np.zeros(0, dtype=np.int64)]
+    for start in range(0, len(ra), chunk):
+        ra_pts, dec_pts = disc_points(ra[start:start + chunk, None],
+                                      dec[start:start + chunk, None],
+                                      radius + margin, resol / 4)
+        # Pixels around each position, without repetitions in a row.
+        found = np.sort(ang2pix(nside, ra_pts.ravel(), dec_pts.ravel(),
+                                nest=True).reshape(ra_pts.shape), axis=1)
+        first = np.ones(found.shape, dtype=bool)
+        first[:, 1:] = found[:, 1:] != found[:, :-1]
+        positions.append(np.nonzero(first)[0] + start)
+        pixels.append(found[first])
+    return np.concatenate(positions), np.concatenate(pixels)
+
+
+def sorted_rows(sorted_hpix, pixels):
+    '''
+    Return the pairs (pixel indices, rows) of the rows of an array of
+    sorted pixels equal to each of pixels, by binary search.
+    '''
+    pixels = np.asarray(pixels, dtype=np.int64)
+    starts = np.searchsorted(sorted_hpix, pixels, side="left")
+    lengths = np.searchsorted(sorted_hpix, pixels, side="right") - starts
+    offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    rows = np.arange(lengths.sum()) - offsets + np.repeat(starts, lengths)
+    return np.repeat(np.arange(len(pixels)), lengths), rows
+
+
+def neighbor_candidates(nside, sorted_hpix, ra, dec, radius):
+    '''
+    Return the pairs (position indices, rows) of the rows of an array of
+    sorted nested pixels of nside that fall in pixels overlapping the
+    discs of radius, in degrees, around arrays of positions. The pairs
+    are candidates: their exact distance is left to the caller.
+    The discs are sampled once for each pixel holding positions, around
+    its center and enlarged by the pixel radius, not for each position.
+    '''
+    ra = np.atleast_1d(np.asarray(ra, dtype=float))
+    dec = np.atleast_1d(np.asarray(dec, dtype=float))
+    cells, inverse = np.unique(ang2pix(nside, ra, dec, nest=True),
+                               return_inverse=True)
+    ra_cell, dec_cell = pix2ang(nside, cells, nest=True)
+    cell_index, pixels = disc_pixels(nside, ra_cell, dec_cell,
+                                     radius + PIXRAD_FACTOR *
+                                     nside2resol(nside))
+    index, rows = sorted_rows(sorted_hpix, pixels)
+    pair_cells = cell_index[index]
+
+    # Each row of a cell is a candidate of all positions in the cell.
+    order = np.argsort(inverse.ravel(), kind="stable")
+    counts = np.bincount(inverse.ravel(), minlength=len(cells))
+    cell_starts = np.cumsum(counts) - counts
+    repeats = counts[pair_cells]
+    pairs = np.repeat(np.arange(len(rows)), repeats)
+    offsets = np.arange(repeats.sum()) - np.repeat(np.cumsum(repeats) -
+                                                   repeats, repeats)
+    positions = order[cell_starts[pair_cells[pairs]] + offsets]
+    return positions, rows[pairs]
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    DESCRIPTION = '''Compare the disc queries with the inclusive
+    query_disc of healpy, at the poles and at other latitudes.
+    '''
+    PARSER = argparse.ArgumentParser(
+        description=DESCRIPTION)
+
+    PARSER.add_argument("-n",
+                        help="NSIDE of the map. default 128",
+                        type=int,
+                        default=128)
+
+    ARGS = PARSER.parse_args()
+
+    import healpy
+
+    RA = 123.4
+    FAILED = 0
+    for DEC in (90.0, -90.0, 89.9, -89.5, 45.0, 0.0, -30.0):
+        for RADIUS in (0.3, 2.0, 5.0):
+            VECTOR = healpy.ang2vec(RA, DEC, lonlat=True)
+            EXPECTED = healpy.query_disc(ARGS.n, VECTOR, np.radians(RADIUS),
+                                         inclusive=True, nest=True)
+            FOUND = query_disc(ARGS.n, RA, DEC, RADIUS)
+            _, DISC = disc_pixels(ARGS.n, RA, DEC, RADIUS)
+            MISSING = np.union1d(np.setdiff1d(EXPECTED, FOUND),
+                                 np.setdiff1d(EXPECTED, DISC))
+            FAILED += len(MISSING) > 0
+            print("DEC {0:6.1f} radius {1:3.1f}: {2} pixels, {3} missing."
+                  .format(DEC, RADIUS, len(EXPECTED), len(MISSING)))
+    sys.exit(1 if FAILED else 0)
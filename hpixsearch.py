@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+# -*- Coding: UTF-8 -*-
+"""
+Cone and box search of tiles and reduced images (rc) through the HEALPix
+mapping tables tile2hpix and reduced2hpix.
+The pixels of the searched region are resolved in NumPy and matched
+against an in-memory pixel -> IDs index of the mapping table, loaded once
+per process, or with a single IN query when use_index is False.
+"""
+import threading
+
+import numpy as np
+
+from config import HPIX_NSIDE, HPIX_NEST
+import healpix
+from lookupcache import FILTER
+from model import db_read as db
+
+__AUTHOR = "E. S. Pereira"
+__DATE = "18/10/2026"
+__EMAIL = "pereira.somoza@gmail.com"
+
+
+class HpixIndex(object):
+    """
+    Pixel -> IDs index of a HEALPix mapping table, held in sorted NumPy
+    arrays. It is loaded, streaming the table, on first use.
+    Attr:
+        table_name: Name of the mapping table
+        id_field: Field with the ID of the mapped object
+    Optional Attr:
+        filter_field: Field with the filter ID of the mapped object
+    """
+
+    def __init__(self, table_name, id_field, filter_field=None):
+        self.table_name = table_name
+        self.id_field = id_field
+        self.filter_field = filter_field
+        self._hpix = None
+        self._ids = None
+        self._filters = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        table = db[self.table_name]
+        fields = [table.hpix, table[self.id_field]]
+        if self.filter_field is not None:
+            fields.append(table[self.filter_field])
+
+        rows = np.array([[-1 if val is None else val for val in row]
+                         for row in db.iter_select(table, fields)],
+                        dtype=np.int64).reshape(-1, len(fields))
+        order = np.argsort(rows[:, 0], kind="stable")
+        self._hpix = rows[order, 0]
+        self._ids = rows[order, 1]
+        if self.filter_field is not None:
+            self._filters = rows[order, 2]
+
+    def _arrays(self):
+        with self._lock:
+            if self._hpix is None:
+                self._load()
+            return self._hpix, self._ids, self._filters
+
+    def invalidate(self):
+        """
+        Force the reload of the index on next use.
+        """
+        with self._lock:
+            self._hpix = None
+            self._ids = None
+            self._filters = None
+
+    def lookup(self, pixels, filter_id=None):
+        """
+        Return the sorted unique IDs mapped to any of pixels, only those
+        in filter_id if given.
+        """
+        hpix, ids, filters = self._arrays()
+        pixels = np.asarray(pixels, dtype=np.int64)
+        starts = np.searchsorted(hpix, pixels, side="left")
+        lengths = np.searchsorted(hpix, pixels, side="right") - starts
+
+        # Positions of all rows of all pixels, without a Python loop.
+        offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        rows = np.arange(lengths.sum()) - offsets + np.repeat(starts,
+                                                              lengths)
+        if filter_id is not None:
+            rows = rows[filters[rows] == filter_id]
+        return np.unique(ids[rows])
+
+
+TILE_INDEX = HpixIndex("tile2hpix", "tile_id")
+REDUCED_INDEX = HpixIndex("reduced2hpix", "image_id", "filter_id")
+
+
+def _query_ids(pixels, table_name, id_field, filter_field=None,
+               filter_id=None):
+    """
+    Return the IDs mapped to pixels, from a single IN query.
+    """
+    table = db[table_name]
+    query = table.hpix.belongs([int(pix) for pix in pixels])
+    if filter_id is not None:
+        query &= table[filter_field] == filter_id
+    rows = db(query).select(table[id_field], distinct=True)
+    return np.unique(np.array([row[id_field] for row in rows],
+                              dtype=np.int64))
+
+
+def tile_ids(pixels, filt=None, use_index=True):
+    """
+    Return the IDs of the tiles mapped to pixels. If filt is given, only
+    tiles with tile info in that filter.
+    """
+    if use_index is True:
+        ids = TILE_INDEX.lookup(pixels)
+    else:
+        ids = _query_ids(pixels, "tile2hpix", "tile_id")
+
+    if filt is not None and len(ids) > 0:
+        query = ((db.t80tilesinfo.Tile_ID.belongs(ids.tolist()))
+                 &
+                 (db.t80tilesinfo.Filter_ID == FILTER.id(filt)))
+        rows = db(query).select(db.t80tilesinfo.Tile_ID, distinct=True)
+        ids = np.intersect1d(ids, [row.Tile_ID for row in rows])
+    return ids
+
+
+def image_ids(pixels, filt=None, use_index=True):
+    """
+    Return the IDs of the reduced images (rc) mapped to pixels, only
+    those in filt if given.
+    """
+    filter_id = None if filt is None else FILTER.id(filt)
+    if filt is not None and filter_id is None:
+        return np.zeros(0, dtype=np.int64)
+    if use_index is True:
+        return REDUCED_INDEX.lookup(pixels, filter_id)
+    return _query_ids(pixels, "reduced2hpix", "image_id", "filter_id",
+                      filter_id)
+
+
+def _tiles(ids):
+    if len(ids) == 0:
+        return []
+    return db(db.t80tiles.id.belongs(ids.tolist())).select(
+        db.t80tiles.id, db.t80tiles.PName, db.t80tiles.RA, db.t80tiles.DEC,
+        orderby=db.t80tiles.id)
+
+
+def _images(ids):
+    if len(ids) == 0:
+        return []
+    return db(db.rc.id.belongs(ids.tolist())).select(
+        db.rc.id, db.rc.NAMERED, db.rc.ori_id, orderby=db.rc.id)
+
+
+def cone_pixels(ra, dec, radius):
+    """
+    Return the pixels of config.HPIX_NSIDE overlapping a cone, in degrees.
+    """
+    return healpix.query_disc(HPIX_NSIDE, ra, dec, radius, HPIX_NEST)
+
+
+def box_pixels(ra_min, ra_max, dec_min, dec_max):
+    """
+    Return the pixels of config.HPIX_NSIDE overlapping a box, in degrees.
+    """
+    return healpix.query_box(HPIX_NSIDE, ra_min, ra_max, dec_min, dec_max,
+                             HPIX_NEST)
+
+
+def cone_search_tiles(ra, dec, radius, filt=None, use_index=True):
+    """
+    Return the t80tiles rows (id, PName, RA, DEC) of the tiles mapped to
+    the HEALPix pixels overlapping a cone, in degrees.
+    """
+    return _tiles(tile_ids(cone_pixels(ra, dec, radius), filt, use_index))
+
+
+def box_search_tiles(ra_min, ra_max, dec_min, dec_max, filt=None,
+                     use_index=True):
+    """
+    Return the t80tiles rows of the tiles mapped to the HEALPix pixels
+    overlapping a box, in degrees. If ra_min > ra_max the box crosses
+    RA = 0.
+    """
+    return _tiles(tile_ids(box_pixels(ra_min, ra_max, dec_min, dec_max),
+                           filt, use_index))
+
+
+def cone_search_images(ra, dec, radius, filt=None, use_index=True):
+    """
+    Return the rc rows (id, NAMERED, ori_id) of the reduced images mapped
+    to the HEALPix pixels overlapping a cone, in degrees.
+    """
+    return _images(image_ids(cone_pixels(ra, dec, radius), filt,
+                             use_index))
+
+
+def box_search_images(ra_min, ra_max, dec_min, dec_max, filt=None,
+                      use_index=True):
+    """
+    Return the rc rows of the reduced images mapped to the HEALPix pixels
+    overlapping a box, in degrees.
+    """
+    return _images(image_ids(box_pixels(ra_min, ra_max, dec_min, dec_max),
+                             filt, use_index))
+
+
+if __name__ == "__main__":
+    import argparse
+    DESCRIPTION = '''Search the tiles or reduced images in a cone
+    (-r RA -d DEC -c RADIUS) or a box (-b RAMIN RAMAX DECMIN DECMAX),
+    in degrees.
+    '''
+    PARSER = argparse.ArgumentParser(
+        description=DESCRIPTION)
+
+    PARSER.add_argument("-r",
+                        help="RA of the center of the cone",
+                        type=float,
+                        default=None)
+
+    PARSER.add_argument("-d",
+                        help="DEC of the center of the cone",
+                        type=float,
+                        default=None)
+
+    PARSER.add_argument("-c",
+                        help="Radius of the cone. default 1",
+                        type=float,
+                        default=1.0)
+
+    PARSER.add_argument("-b",
+                        help="Box: RAMIN RAMAX DECMIN DECMAX",
+                        type=float,
+                        nargs=4,
+                        default=None)
+
+    PARSER.add_argument("-f",
+                        help="Filter name",
+                        type=str,
+                        default=None)
+
+    PARSER.add_argument("-i",
+                        help="Search reduced images instead of tiles",
+                        action="store_true")
+
+    ARGS = PARSER.parse_args()
+
+    if ARGS.b is not None:
+        SEARCH = box_search_images if ARGS.i else box_search_tiles
+        ROWS = SEARCH(*ARGS.b, filt=ARGS.f)
+    elif ARGS.r is not None and ARGS.d is not None:
+        SEARCH = cone_search_images if ARGS.i else cone_search_tiles
+        ROWS = SEARCH(ARGS.r, ARGS.d, ARGS.c, filt=ARGS.f)
+    else:
+        PARSER.error("Pass a cone (-r, -d) or a box (-b)")
+
+    for ROW in ROWS:
+        print(ROW.as_dict())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- Coding: UTF-8 -*-
+"""
+Local SQLite ledger of the files transferred by the Auto Transfer Bot.
+"""
+import sqlite3
+import threading
+import time
+
+__AUTHOR = "E. S. Pereira"
+__DATE = "18/10/2026"
+__EMAIL = "pereira.somoza@gmail.com"
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    relpath TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime REAL,
+    datasum TEXT,
+    checksum TEXT,
+    tile_id INTEGER,
+    status TEXT NOT NULL,
+    error TEXT,
+    started REAL,
+    finished REAL,
+    duration REAL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_status ON files (status);
+CREATE INDEX IF NOT EXISTS files_updated ON files (updated);
+CREATE INDEX IF NOT EXISTS files_tile_id ON files (tile_id);
+"""
+
+COLUMNS = ("relpath", "size", "mtime", "datasum", "checksum", "tile_id",
+           "status", "error", "started", "finished", "duration", "updated")
+
+
+class TransferLedger(object):
+    """
+    Record of each transferred file (size, checksums, tile ID, timings and
+    status), shared by the threads of the transfer engine.
+    Attr:
+        path: SQLite file of the ledger
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        """
+        Close the ledger.
+        """
+        with self._lock:
+            self._conn.close()
+
+    def add_pending(self, items):
+        """
+        Add the items of a manifest not yet in the ledger as pending.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO files (relpath, datasum, checksum, "
+                "tile_id, status, updated) VALUES (?, ?, ?, ?, 'pending', ?)",
+                [(item.relpath, _as_text(item.datasum), item.checksum,
+                  item.tile_id, now) for item in items])
+
+    def is_done(self, relpath, size, mtime):
+        """
+        Verify if a file was already transferred with the given size and
+        modification time.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM files WHERE relpath = ? AND status = 'done' "
+                "AND size = ? AND mtime = ?",
+                (relpath, size, mtime)).fetchone()
+        return row is not None
+
+    def record(self, item, status, size=None, mtime=None, error=None):
+        """
+        Record the status of the file of a TransferItem.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO files (relpath, status, updated) "
+                "VALUES (?, ?, ?)", (item.relpath, status, now))
+            if status == "started":
+                self._conn.execute(
+                    "UPDATE files SET size = ?, mtime = ?, datasum = ?, "
+                    "checksum = ?, tile_id = ?, status = ?, error = NULL, "
+                    "started = ?, finished = NULL, duration = NULL, "
+                    "updated = ? WHERE relpath = ?",
+                    (size, mtime, _as_text(item.datasum), item.checksum,
+                     item.tile_id, status, now, now, item.relpath))
+            else:
+                self._conn.execute(
+                    "UPDATE files SET status = ?, error = ?, finished = ?, "
+                    "duration = ? - started, updated = ? WHERE relpath = ?",
+                    (status, error, now, now, now, item.relpath))
+
+    def _select(self, where, args=()):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM files WHERE {0} ORDER BY updated".format(where),
+                args).fetchall()
+        return [dict(row) for row in rows]
+
+    def pending(self):
+        """
+        Return the files not transferred yet (pending, started or failed).
+        """
+        return self._select("status != 'done'")
+
+    def changed_since(self, since):
+        """
+        Return the files whose status changed after since (a timestamp).
+        """
+        return self._select("updated > ?", (since,))
+
+    def counts(self):
+        """
+        Return a dict with the number of files by status.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM files GROUP BY status"
+            ).fetchall()
+        return {status: count for status, count in rows}
+
+
+def _as_text(value):
+    if value is None:
+        return None
+    return str(value)
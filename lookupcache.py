@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- Coding: UTF-8 -*-
+"""
+In-process cache of the small lookup tables of the Pipeline Data Base
+(filter, frametype, telescope, ccdchip), mapping names to IDs in memory.
+"""
+import threading
+import time
+
+from config import LOOKUP_CACHE_TTL
+from model import db_read as db
+
+__AUTHOR = "E. S. Pereira"
+__DATE = "18/10/2026"
+__EMAIL = "pereira.somoza@gmail.com"
+
+
+class LookupCache(object):
+    """
+    Name <-> ID map of a lookup table, loaded with a single query on first
+    use and reloaded after ttl seconds or when invalidated.
+    Attr:
+        table_name: Name of the table in the model
+    Optional Attr:
+        key: Field used as name, default Name
+        ttl: Time in seconds before reload, None to never expire
+    """
+
+    def __init__(self, table_name, key="Name", ttl=LOOKUP_CACHE_TTL):
+        self.table_name = table_name
+        self.key = key
+        self.ttl = ttl
+        self._ids = None
+        self._names = None
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def _expired(self):
+        if self._ids is None:
+            return True
+        if self.ttl is None:
+            return False
+        return time.time() - self._loaded_at > self.ttl
+
+    def _load(self):
+        table = db[self.table_name]
+        rows = db(table).select(table.id, table[self.key])
+        self._ids = {row[self.key]: row.id for row in rows}
+        self._names = {row.id: row[self.key] for row in rows}
+        self._loaded_at = time.time()
+
+    def _maps(self):
+        with self._lock:
+            if self._expired():
+                self._load()
+            return self._ids, self._names
+
+    def id(self, name):
+        """
+        Return the ID of a name, or None if it is not in the table.
+        """
+        return self._maps()[0].get(name)
+
+    def name(self, idx):
+        """
+        Return the name of an ID, or None if it is not in the table.
+        """
+        return self._maps()[1].get(idx)
+
+    def ids(self, names=None):
+        """
+        Return a dict name -> ID for a list of names (all if None).
+        Names not in the table are left out.
+        """
+        ids = self._maps()[0]
+        if names is None:
+            return dict(ids)
+        return {name: ids[name] for name in names if name in ids}
+
+    def names(self):
+        """
+        Return a dict ID -> name of the whole table.
+        """
+        return dict(self._maps()[1])
+
+    def invalidate(self):
+        """
+        Force the reload of the table on next use.
+        """
+        with self._lock:
+            self._ids = None
+            self._names = None
+
+
+FILTER = LookupCache("filter")
+FRAMETYPE = LookupCache("frametype")
+TELESCOPE = LookupCache("telescope")
+CCDCHIP = LookupCache("ccdchip")
+
+
+def invalidate_all():
+    """
+    Force the reload of all lookup tables on next use.
+    """
+    for cache in (FILTER, FRAMETYPE, TELESCOPE, CCDCHIP):
+        cache.invalidate()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- Coding: UTF-8 -*-
+"""
+Throughput and latency metrics of the Auto Transfer Bot, exposed in the
+Prometheus text format (file or HTTP endpoint) and as JSON lines.
+"""
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import json
+import os
+import threading
+import time
+
+__AUTHOR = "E. S. Pereira"
+__DATE = "18/10/2026"
+__EMAIL = "pereira.somoza@gmail.com"
+
+
+PREFIX = "autotransfer"
+
+
+class TransferMetrics(object):
+    """
+    Counters, gauges and stage timings of the transfers, safe to update
+    from the threads of the transfer engine.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.bytes_total = 0
+        self.files_total = {}
+        self.stage_seconds = {}
+        self.stage_count = {}
+        self.queue_depth = 0
+        self.bytes_per_second = 0.0
+        self.files_per_second = 0.0
+        self.last_run = None
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Time a stage (db_query, copy, verify, ...) of the transfer.
+        """
+        start = time.time()
+        try:
+            yield
+        finally:
+            elapsed = time.time() - start
+            with self._lock:
+                self.stage_seconds[name] = \
+                    self.stage_seconds.get(name, 0.0) + elapsed
+                self.stage_count[name] = self.stage_count.get(name, 0) + 1
+
+    def add_bytes(self, nbytes):
+        """
+        Count nbytes transferred.
+        """
+        with self._lock:
+            self.bytes_total += nbytes
+
+    def add_file(self, status):
+        """
+        Count a file with its final status (done, skipped, failed).
+        """
+        with self._lock:
+            self.files_total[status] = self.files_total.get(status, 0) + 1
+            self.queue_depth = max(self.queue_depth - 1, 0)
+
+    def start_run(self, nfiles):
+        """
+        Start a transfer run of nfiles.
+        """
+        with self._lock:
+            self.queue_depth = nfiles
+            self._run_start = time.time()
+            self._run_bytes = self.bytes_total
+            self._run_files = self.files_total.get("done", 0)
+
+    def finish_run(self):
+        """
+        Finish a transfer run, updating the throughput of the last run.
+        """
+        with self._lock:
+            elapsed = max(time.time() - self._run_start, 1e-6)
+            nbytes = self.bytes_total - self._run_bytes
+            nfiles = self.files_total.get("done", 0) - self._run_files
+            self.bytes_per_second = nbytes / elapsed
+            self.files_per_second = nfiles / elapsed
+            self.last_run = {"time": time.time(),
+                             "seconds": elapsed,
+                             "bytes": nbytes,
+                             "files": nfiles}
+
+    def snapshot(self):
+        """
+        Return a dict with the current values.
+        """
+        with self._lock:
+            return {"time": time.time(),
+                    "bytes_total": self.bytes_total,
+                    "files_total": dict(self.files_total),
+                    "failures_total": self.files_total.get("failed", 0),
+                    "stage_seconds": dict(self.stage_seconds),
+                    "stage_count": dict(self.stage_count),
+                    "queue_depth": self.queue_depth,
+                    "bytes_per_second": self.bytes_per_second,
+                    "files_per_second": self.files_per_second,
+                    "last_run": self.last_run}
+
+    def prometheus_text(self):
+        """
+        Return the metrics in the Prometheus text exposition format.
+        """
+        snap = self.snapshot()
+        lines = []
+
+        def metric(name, kind, helptext, samples):
+            lines.append("# HELP {0}_{1} {2}".format(PREFIX, name, helptext))
+            lines.append("# TYPE {0}_{1} {2}".format(PREFIX, name, kind))
+            for labels, value in samples:
+                lines.append("{0}_{1}{2} {3}".format(PREFIX, name, labels,
+                                                     value))
+
+        metric("bytes_total", "counter", "Bytes transferred.",
+               [("", snap["bytes_total"])])
+        metric("files_total", "counter", "Files by final status.",
+               [('{{status="{0}"}}'.format(status), count)
+                for status, count in sorted(snap["files_total"].items())])
+        metric("failures_total", "counter", "Files failed.",
+               [("", snap["failures_total"])])
+        metric("stage_seconds_total", "counter", "Time spent by stage.",
+               [('{{stage="{0}"}}'.format(stage), seconds)
+                for stage, seconds in sorted(snap["stage_seconds"].items())])
+        metric("stage_runs_total", "counter", "Executions by stage.",
+               [('{{stage="{0}"}}'.format(stage), count)
+                for stage, count in sorted(snap["stage_count"].items())])
+        metric("queue_depth", "gauge", "Files waiting in the current run.",
+               [("", snap["queue_depth"])])
+        metric("bytes_per_second", "gauge", "Throughput of the last run.",
+               [("", snap["bytes_per_second"])])
+        metric("files_per_second", "gauge", "Files per second of the last "
+               "run.", [("", snap["files_per_second"])])
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """
+        Write the metrics to a file for the node exporter textfile
+        collector, replacing it atomically.
+        """
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as prom_file:
+            prom_file.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+    def append_jsonl(self, path):
+        """
+        Append the current values as a JSON line.
+        """
+        with open(path, "a") as jsonl_file:
+            jsonl_file.write(json.dumps(self.snapshot()) + "\n")
+
+    def serve(self, port, host=""):
+        """
+        Serve the metrics at http://host:port/metrics from a daemon thread.
+        Return the HTTPServer.
+        """
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                body = metrics.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type",
+                                 "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer((host, port), Handler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return server
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- Coding: UTF-8 -*-
+"""
+Incremental detection of new reduced data in the Pipeline Data Base,
+using high-water marks persisted in the work directory of the bot.
+"""
+from datetime import datetime
+import json
+import os
+
+from model import db
+
+__AUTHOR = "E. S. Pereira"
+__DATE = "18/10/2026"
+__EMAIL = "pereira.somoza@gmail.com"
+
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _marks_fields():
+    return [("UPDATEDATE_tile", db.t80tilesinfo.UPDATEDATE_tile),
+            ("UPDATEDATE_OA", db.t80oa.UPDATEDATE_OA),
+            ("tilestoload_id", db.t80tilestoload.id)]
+
+
+def as_mark(value):
+    '''
+    Return a high-water mark from a value of the Data Base.
+    '''
+    if isinstance(value, datetime):
+        return value.strftime(TIME_FORMAT)
+    if value is None or isinstance(value, int):
+        return value
+    return str(value)[:19]
+
+
+def get_marks():
+    '''
+    Return the current high-water marks of the Pipeline Data Base, from a
+    single query over the indexed update columns.
+    '''
+    subqueries = ["({0})".format(db(field.table)._select(field.max())
+                                 .rstrip(";"))
+                  for _, field in _marks_fields()]
+    values = db.executesql("SELECT {0};".format(", ".join(subqueries)))[0]
+    return {name: as_mark(value)
+            for (name, _), value in zip(_marks_fields(), values)}
+
+
+def as_datetime(mark):
+    '''
+    Return the datetime of a timestamp high-water mark.
+    '''
+    if mark is None:
+        return None
+    return datetime.strptime(mark, TIME_FORMAT)
+
+
+class DataWatcher(object):
+    """
+    Track the high-water marks of the Pipeline Data Base already
+    transferred, saved as JSON in the work directory.
+    Attr:
+        work_dir: Directory where the marks file is saved
+    """
+
+    def __init__(self, work_dir, filename="highwater.json"):
+        self._path = os.path.join(work_dir, filename)
+        self.marks = self._load()
+        self.pending = None
+
+    def _load(self):
+        if os.path.isfile(self._path) is False:
+            return {name: None for name, _ in _marks_fields()}
+        with open(self._path) as marks_file:
+            return json.load(marks_file)
+
+    def poll(self):
+        """
+        Query the current marks and return the names of those that are
+        newer than the transferred ones.
+        """
+        self.pending = get_marks()
+        return [name for name, value in self.pending.items()
+                if value is not None and
+                (self.marks.get(name) is None or value > self.marks[name])]
+
+    def has_new(self):
+        """
+        Verify if there are new data since the last commit.
+        """
+        return len(self.poll()) > 0
+
+    def commit(self):
+        """
+        Save the marks of the last poll as transferred.
+        """
+        if self.pending is None:
+            return
+        self.marks = self.pending
+        tmp_path = self._path + ".tmp"
+        with open(tmp_path, "w") as marks_file:
+            json.dump(self.marks, marks_file)
+        os.replace(tmp_path, self._path)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+# -*- Coding: UTF-8 -*-
+"""
+Spatial index of the pointings (RA, DEC of the exposure centers) of
+t80oa: the exposures sorted by HEALPix pixel in NumPy arrays, saved to a
+.npz file and refreshed incrementally from UPDATEDATE_OA.
+A neighbor query for thousands of positions is answered in one
+vectorized call: the pixels around every pixel holding positions are
+resolved at once and the exposures of those pixels found by binary
+search.
+"""
+import os
+
+import numpy as np
+
+from config import POINTING_INDEX_PATH
+import healpix
+from model import db_read as db
+from newdata import as_datetime, as_mark
+
+__AUTHOR = "E. S. Pereira"
+__DATE = "18/10/2026"
+__EMAIL = "pereira.somoza@gmail.com"
+
+
+# Nested HEALPix map of the index, 0.46 degrees resolution.
+INDEX_NSIDE = 128
+
+# Radius, in degrees, of the circle enclosing the field of an exposure.
+FIELD_RADIUS = 1.0
+
+
+class PointingIndex(object):
+    """
+    Exposure centers of t80oa sorted by HEALPix pixel.
+    Optional Attr:
+        nside: Resolution of the nested HEALPix map of the index
+    """
+
+    def __init__(self, nside=INDEX_NSIDE):
+        self.nside = nside
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.ra = np.zeros(0)
+        self.dec = np.zeros(0)
+        self.hpix = np.zeros(0, dtype=np.int64)
+        self.mark = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _scan(self, since=None, chunk_size=10000):
+        '''
+        Return the id, RA, DEC arrays, the ids without RA or DEC, which
+        are not indexed, and the high-water mark of the exposures of t80oa
+        updated at or after since (all if None).
+        '''
+        query = db.t80oa.id > 0
+        if since is not None:
+            query &= db.t80oa.UPDATEDATE_OA >= as_datetime(since)
+
+        ids, ras, decs, dropped = [], [], [], []
+        mark = since
+        for idx, ra, dec, updated in db.iter_select(
+                query, [db.t80oa.id, db.t80oa.RA, db.t80oa.DEC,
+                        db.t80oa.UPDATEDATE_OA], chunk_size):
+            updated = as_mark(updated)
+            if updated is not None and (mark is None or updated > mark):
+                mark = updated
+            if ra is None or dec is None:
+                dropped.append(idx)
+                continue
+            ids.append(idx)
+            ras.append(float(ra))
+            decs.append(float(dec))
+        return (np.array(ids, dtype=np.int64), np.array(ras),
+                np.array(decs), np.array(dropped, dtype=np.int64), mark)
+
+    def _set(self, ids, ra, dec):
+        hpix = healpix.ang2pix(self.nside, ra, dec, nest=True)
+        order = np.lexsort((ids, hpix))
+        self.ids = ids[order]
+        self.ra = ra[order]
+        self.dec = dec[order]
+        self.hpix = hpix[order]
+
+    def build(self, chunk_size=10000):
+        '''
+        Build the index from a streaming scan of t80oa.
+        '''
+        ids, ra, dec, _, self.mark = self._scan(None, chunk_size)
+        self._set(ids, ra, dec)
+
+    def refresh(self, chunk_size=10000):
+        '''
+        Add the exposures inserted or moved since the last build or
+        refresh, and remove those whose RA or DEC became NULL. The rows
+        updated at the high-water mark itself are read again, so the
+        exposures at an unchanged position are not counted.
+        Return the number of exposures added, moved or removed.
+        '''
+        if self.mark is None:
+            self.build(chunk_size)
+            return len(self)
+        ids, ra, dec, dropped, self.mark = self._scan(self.mark, chunk_size)
+
+        # Exposures read again at the same position are not changes.
+        moved = np.ones(len(ids), dtype=bool)
+        if len(self) > 0:
+            order = np.argsort(self.ids)
+            at = order[np.minimum(np.searchsorted(self.ids, ids,
+                                                  sorter=order),
+                                  len(order) - 1)]
+            moved = ((self.ids[at] != ids) | (self.ra[at] != ra) |
+                     (self.dec[at] != dec))
+        ids, ra, dec = ids[moved], ra[moved], dec[moved]
+        removed = np.isin(self.ids, dropped)
+        if len(ids) == 0 and not removed.any():
+            return 0
+
+        keep = ~np.isin(self.ids, ids) & ~removed
+        self._set(np.concatenate([self.ids[keep], ids]),
+                  np.concatenate([self.ra[keep], ra]),
+                  np.concatenate([self.dec[keep], dec]))
+        return len(ids) + int(removed.sum())
+
+    def save(self, path=POINTING_INDEX_PATH):
+        '''
+        Save the index to a .npz file, replacing it atomically.
+        '''
+        tmp_path = path + ".part.npz"
+        np.savez(tmp_path, ids=self.ids, ra=self.ra, dec=self.dec,
+                 nside=self.nside,
+                 mark="" if self.mark is None else self.mark)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=POINTING_INDEX_PATH):
+        '''
+        Return the index saved in path.
+        '''
+        with np.load(path) as saved:
+            index = cls(int(saved["nside"]))
+            index._set(saved["ids"], saved["ra"], saved["dec"])
+            index.mark = str(saved["mark"]) or None
+        return index
+
+    @classmethod
+    def open(cls, path=POINTING_INDEX_PATH, refresh=True):
+        '''
+        Return the index saved in path, refreshed from t80oa, or a new one
+        built from t80oa if there is no file. The index is saved back
+        when anything changed.
+        '''
+        if os.path.isfile(path):
+            index = cls.load(path)
+            if refresh is False:
+                return index
+            mark = index.mark
+            if index.refresh() == 0 and index.mark == mark:
+                return index
+        else:
+            index = cls()
+            index.build()
+        index.save(path)
+        return index
+
+    def neighbors(self, ra, dec, radius):
+        '''
+        Return, for arrays of positions, the pairs closer than radius, in
+        degrees: the position indices, the exposure ids and distances,
+        sorted by position.
+        '''
+        ra = np.atleast_1d(np.asarray(ra, dtype=float))
+        dec = np.atleast_1d(np.asarray(dec, dtype=float))
+        positions, rows = healpix.neighbor_candidates(self.nside, self.hpix,
+                                                      ra, dec, radius)
+
+        distance = healpix.angular_distance(ra[positions], dec[positions],
+                                            self.ra[rows], self.dec[rows])
+        close = distance <= radius
+        positions, rows, distance = positions[close], rows[close], \
+            distance[close]
+        order = np.lexsort((distance, positions))
+        return positions[order], self.ids[rows[order]], distance[order]
+
+    def overlapping(self, ra, dec, radius=FIELD_RADIUS):
+        '''
+        Return the pairs (position indices, exposure ids, distances) of
+        exposures whose field may overlap circles of radius around the
+        positions, comparing the enclosing circles of the fields.
+        '''
+        return self.neighbors(ra, dec, radius + FIELD_RADIUS)
+
+
+def split_pairs(npositions, positions, values):
+    '''
+    Split the pairs returned by the queries in a list, by position, of
+    arrays of values.
+    '''
+    bounds = np.searchsorted(positions, np.arange(npositions + 1))
+    return [values[bounds[i]:bounds[i + 1]] for i in range(npositions)]
+
+
+if __name__ == "__main__":
+    import argparse
+    DESCRIPTION = '''Build or refresh the index of exposure pointings and
+    search the exposures around a position.
+    '''
+    PARSER = argparse.ArgumentParser(
+        description=DESCRIPTION)
+
+    PARSER.add_argument("-i",
+                        help="Index file. default config.POINTING_INDEX_PATH",
+                        type=str,
+                        default=POINTING_INDEX_PATH)
+
+    PARSER.add_argument("-r",
+                        help="RA of the position, in degrees",
+                        type=float,
+                        default=None)
+
+    PARSER.add_argument("-d",
+                        help="DEC of the position, in degrees",
+                        type=float,
+                        default=None)
+
+    PARSER.add_argument("-c",
+                        help="Search radius, in degrees. default 1",
+                        type=float,
+                        default=1.0)
+
+    ARGS = PARSER.parse_args()
+
+    INDEX = PointingIndex.open(ARGS.i)
+    print("{0} exposures, updated up to {1}.".format(len(INDEX),
+                                                     INDEX.mark))
+    if ARGS.r is not None and ARGS.d is not None:
+        _, IDS, DISTANCES = INDEX.neighbors(ARGS.r, ARGS.d, ARGS.c)
+        for IDX, DISTANCE in zip(IDS, DISTANCES):
+            print("{0} {1:.4f}".format(IDX, DISTANCE))
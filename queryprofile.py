@@ -0,0 +1,261 @@
+#!/usr/bin/env python
+# -*- Coding: UTF-8 -*-
+"""
+Opt-in profiling of the queries sent to the Pipeline Data Base.
+When the environment variable AUTOTRANSFER_QUERY_PROFILE is set, every
+query of model.db is recorded with its SQL, number of rows, wall time and
+calling function, and a report with the slowest statements and the N+1
+patterns (the same statement repeated with different values) is written
+at exit: to stderr when the variable is 1, otherwise appended to the file
+it names. When the variable is not set nothing is wrapped.
+"""
+import atexit
+from collections import OrderedDict
+import os
+import re
+import sys
+import threading
+import time
+
+__AUTHOR = "E. S. Pereira"
+__DATE = "18/10/2026"
+__EMAIL = "pereira.somoza@gmail.com"
+
+
+QUERY_PROFILE_ENV = "AUTOTRANSFER_QUERY_PROFILE"
+
+# Frames of these modules are skipped when looking for the caller.
+_SKIP_FILES = ("queryprofile.py", "model.py")
+_PYDAL_DIR = os.sep + "pydal" + os.sep
+
+# Functions of pyDAL whose statements are not recorded: the test of a
+# connection (SELECT 1) and the setup of a new one (PRAGMA, SET).
+_CONNECTION_SETUP = ("test_connection", "after_connection_hook",
+                     "after_connection")
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?")
+_IN_LIST_RE = re.compile(r"IN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+
+
+def normalize(sql):
+    """
+    Return the statement of a SQL, with its literals replaced by ? and
+    the IN lists collapsed, so queries differing only on values match.
+    """
+    statement = _STRING_RE.sub("?", sql)
+    statement = _NUMBER_RE.sub("?", statement)
+    statement = _IN_LIST_RE.sub("IN (...)", statement)
+    return " ".join(statement.split())
+
+
+def _in_connection_setup():
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_code.co_name in _CONNECTION_SETUP and \
+                _PYDAL_DIR in frame.f_code.co_filename:
+            return True
+        frame = frame.f_back
+    return False
+
+
+def _caller():
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if _PYDAL_DIR not in filename and \
+                not filename.endswith(_SKIP_FILES):
+            return "{0}:{1}:{2}".format(os.path.basename(filename),
+                                        frame.f_code.co_name,
+                                        frame.f_lineno)
+        frame = frame.f_back
+    return None
+
+
+class QueryRecord(object):
+    """
+    A query sent to the Data Base.
+    Attr:
+        sql: SQL text
+        statement: normalized SQL
+        seconds: Wall time of the execution
+        caller: module:function:line that issued the query
+        rows: Number of rows fetched, None if not a select
+    """
+    __slots__ = ("sql", "statement", "seconds", "caller", "rows")
+
+    def __init__(self, sql, seconds, caller, rows=None):
+        self.sql = sql
+        self.statement = normalize(sql)
+        self.seconds = seconds
+        self.caller = caller
+        self.rows = rows
+
+
+class QueryProfiler(object):
+    """
+    Record the queries executed by pyDAL adapters.
+    Optional Attr:
+        top: Number of statements in the report
+        nplus1: Minimum repetitions of a statement, with different values,
+        reported as an N+1 pattern
+    """
+
+    def __init__(self, top=10, nplus1=5):
+        self.top = top
+        self.nplus1 = nplus1
+        self.records = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @classmethod
+    def from_env(cls):
+        """
+        Return a QueryProfiler reporting at exit if QUERY_PROFILE_ENV is
+        set, None otherwise.
+        """
+        target = os.environ.get(QUERY_PROFILE_ENV, "")
+        if target in ("", "0"):
+            return None
+        profiler = cls()
+        atexit.register(profiler.write_report,
+                        None if target == "1" else target)
+        return profiler
+
+    def install(self, adapter):
+        """
+        Wrap execute and the select fetch of a pyDAL adapter.
+        """
+        execute = adapter.execute
+        select_execute = adapter._select_aux_execute
+
+        def profiled_execute(*args, **kwargs):
+            if _in_connection_setup():
+                return execute(*args, **kwargs)
+            sql = str(args[0]) if args else ""
+            start = time.time()
+            try:
+                return execute(*args, **kwargs)
+            finally:
+                record = QueryRecord(sql, time.time() - start, _caller())
+                self._local.last = record
+                with self._lock:
+                    self.records.append(record)
+
+        def profiled_select(sql):
+            rows = select_execute(sql)
+            record = getattr(self._local, "last", None)
+            if record is not None:
+                record.rows = len(rows)
+            return rows
+
+        adapter.execute = profiled_execute
+        adapter._select_aux_execute = profiled_select
+
+    def reset(self):
+        """
+        Forget the recorded queries.
+        """
+        with self._lock:
+            self.records = []
+
+    def statements(self):
+        """
+        Return the recorded queries aggregated by statement, a dict of
+        statement: {count, seconds, max_seconds, rows, values, callers},
+        sorted by total time.
+        """
+        with self._lock:
+            records = list(self.records)
+
+        stats = {}
+        for record in records:
+            stat = stats.setdefault(record.statement,
+                                    {"count": 0,
+                                     "seconds": 0.0,
+                                     "max_seconds": 0.0,
+                                     "rows": 0,
+                                     "values": set(),
+                                     "callers": set()})
+            stat["count"] += 1
+            stat["seconds"] += record.seconds
+            stat["max_seconds"] = max(stat["max_seconds"], record.seconds)
+            stat["rows"] += record.rows or 0
+            stat["values"].add(record.sql)
+            stat["callers"].add(record.caller)
+
+        return OrderedDict(sorted(stats.items(),
+                                  key=lambda item: -item[1]["seconds"]))
+
+    def top_slow(self, top=None):
+        """
+        Return the top slowest single queries.
+        """
+        with self._lock:
+            records = list(self.records)
+        records.sort(key=lambda record: -record.seconds)
+        return records[:top or self.top]
+
+    def n_plus_one(self, nplus1=None):
+        """
+        Return the statements executed at least nplus1 times with
+        different values, as in a loop querying one id at a time.
+        """
+        nplus1 = nplus1 or self.nplus1
+        return OrderedDict((statement, stat)
+                           for statement, stat in self.statements().items()
+                           if len(stat["values"]) >= nplus1)
+
+    def report(self):
+        """
+        Return a text report of the recorded queries.
+        """
+        stats = self.statements()
+        total = sum(stat["seconds"] for stat in stats.values())
+        lines = ["Queries: {0}. Statements: {1}. Time: {2:.3f} s.".format(
+            sum(stat["count"] for stat in stats.values()), len(stats),
+            total)]
+
+        lines.append("")
+        lines.append("Top statements by total time:")
+        for statement, stat in list(stats.items())[:self.top]:
+            lines.append("  {0:9.3f} s {1:6d}x max {2:.3f} s {3:8d} rows  "
+                         "{4}".format(stat["seconds"], stat["count"],
+                                      stat["max_seconds"], stat["rows"],
+                                      statement))
+            lines.append("      from: {0}".format(
+                ", ".join(sorted(str(caller)
+                                 for caller in stat["callers"]))))
+
+        lines.append("")
+        lines.append("Slowest queries:")
+        for record in self.top_slow():
+            lines.append("  {0:9.3f} s {1} {2}".format(
+                record.seconds, record.caller, " ".join(record.sql.split())))
+
+        nplus1 = self.n_plus_one()
+        if nplus1:
+            lines.append("")
+            lines.append("Possible N+1 patterns:")
+            for statement, stat in nplus1.items():
+                lines.append("  {0}x from {1}: {2}".format(
+                    stat["count"],
+                    ", ".join(sorted(str(caller)
+                                     for caller in stat["callers"])),
+                    statement))
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, path=None):
+        """
+        Write the report to stderr or append it to path.
+        """
+        if not self.records:
+            return
+        if path is None:
+            sys.stderr.write(self.report())
+            return
+        with open(path, "a") as report_file:
+            report_file.write(self.report())
+
+
+PROFILER = QueryProfiler.from_env()
@@ -3,7 +3,10 @@
 """
 Search for images in the Pipeline Data Base.
 """
-from model import db
+import numpy as np
+
+from model import db_read as db
+from lookupcache import FILTER, FRAMETYPE
 
 __AUTHOR = "E. S. Pereira"
 __DATE = "15/06/2017"
@@ -15,8 +18,7 @@ def search_images(start_date, end_date, frametype, filt=None):
     Return the available images in a given day.
     """
 
-    type_id = db(db.frametype.Name == frametype).select(
-            db.frametype.id).first()
+    type_id = FRAMETYPE.id(frametype)
     nimages = 0
     if frametype == "BIAS":
         nimages = db((db.t80oa.ImageType_ID == type_id)
@@ -27,7 +29,7 @@ def search_images(start_date, end_date, frametype, filt=None):
         nimages = [img.Name for img in nimages]
     else:
         if filt is not None:
-            filter_id = db(db.filter.Name == filt).select(db.filter.id).first()
+            filter_id = FILTER.id(filt)
             nimages = db((db.t80oa.ImageType_ID == type_id)
                          &
                          (db.t80oa.Filter_ID == filter_id)
@@ -45,8 +47,7 @@ def count_images(start_date, end_date, frametype, filt=None):
     """
     Return the Number of images in the Pipeline Data Base.
     """
-    type_id = db(db.frametype.Name == frametype).select(
-            db.frametype.id).first()
+    type_id = FRAMETYPE.id(frametype)
 
     nimages = 0
     if frametype == "BIAS":
@@ -57,7 +58,7 @@ def count_images(start_date, end_date, frametype, filt=None):
                      (db.t80oa.Date <= end_date)).count()
     else:
         if filt is not None:
-            filter_id = db(db.filter.Name == filt).select(db.filter.id).first()
+            filter_id = FILTER.id(filt)
             nimages = db((db.t80oa.ImageType_ID == type_id)
                          &
                          (db.t80oa.Filter_ID == filter_id)
@@ -70,6 +71,153 @@ def count_images(start_date, end_date, frametype, filt=None):
     return nimages
 
 
+def iter_images(start_date, end_date, frametype, filt=None,
+                fields=("Name",), chunk_size=1000):
+    """
+    Yield a tuple with the requested t80oa fields for each available
+    image in a date range, streamed in chunks of chunk_size.
+    """
+    query = ((db.t80oa.ImageType_ID == FRAMETYPE.id(frametype))
+             &
+             (db.t80oa.Date >= start_date)
+             &
+             (db.t80oa.Date <= end_date))
+    if frametype != "BIAS":
+        if filt is None:
+            raise NameError("No Filter Passed")
+        query &= db.t80oa.Filter_ID == FILTER.id(filt)
+
+    return db.iter_select(query, [db.t80oa[name] for name in fields],
+                          chunk_size)
+
+
+def _bulk_query(start_date, end_date, frametypes, filts):
+    """
+    Return the t80oa query for lists of frame types and filters in a date
+    range, and the dicts id -> Name of the frame types and filters.
+    """
+    type_ids = FRAMETYPE.ids()
+    filter_ids = FILTER.ids()
+    type_names = {type_ids[name]: name for name in frametypes
+                  if name in type_ids}
+    filter_names = FILTER.names()
+
+    query = ((db.t80oa.ImageType_ID.belongs(list(type_names)))
+             &
+             (db.t80oa.Date >= start_date)
+             &
+             (db.t80oa.Date <= end_date))
+
+    if filts is not None:
+        by_filter = db.t80oa.Filter_ID.belongs([filter_ids[name]
+                                                for name in filts
+                                                if name in filter_ids])
+        if "BIAS" in type_ids:
+            by_filter |= db.t80oa.ImageType_ID == type_ids["BIAS"]
+        query &= by_filter
+
+    return query, type_names, filter_names
+
+
+def _filter_name(frametype, filter_id, filter_names):
+    if frametype == "BIAS":
+        return None
+    return filter_names.get(filter_id)
+
+
+def _key_order(key):
+    """
+    Sort key of the keys of count_images_matrix: by their values, dates
+    and numbers in their natural order, None last.
+    """
+    return tuple((value is None, value) for value in key)
+
+
+def search_images_bulk(start_date, end_date, frametypes, filts=None):
+    """
+    Return the available images for a list of frame types and filters in a
+    date range, from a single query. The result is a dict of list of names
+    indexed by (frametype, filter, date); the filter of BIAS is None.
+    If filts is None, images in any filter are returned.
+    """
+    query, type_names, filter_names = _bulk_query(start_date, end_date,
+                                                  frametypes, filts)
+    if len(type_names) == 0:
+        return {}
+
+    rows = db(query).select(db.t80oa.Name,
+                            db.t80oa.ImageType_ID,
+                            db.t80oa.Filter_ID,
+                            db.t80oa.Date,
+                            orderby=db.t80oa.Date | db.t80oa.id)
+
+    images = {}
+    for row in rows:
+        frametype = type_names[row.ImageType_ID]
+        filt = _filter_name(frametype, row.Filter_ID, filter_names)
+        images.setdefault((frametype, filt, row.Date), []).append(row.Name)
+    return images
+
+
+COUNT_DTYPE = [('FRAMETYPE', 'U10'),
+               ('FILTER', 'U15'),
+               ('DATE', 'datetime64[D]'),
+               ('IS_VALID', 'i4'),
+               ('QUALITY_FLAG', 'i4'),
+               ('COUNT', 'i8')]
+
+
+def count_images_matrix(start_date, end_date, frametypes, filts=None,
+                        by_valid=False, by_quality=False, as_array=False):
+    """
+    Return the Number of images by frame type, filter and night, from a
+    single GROUP BY query. The result is a dict indexed by
+    (frametype, filter, date), with is_valid and Quality_FLAG appended to
+    the key when by_valid and by_quality are True. The filter of BIAS is
+    None. If as_array is True a NumPy structured array is returned, where
+    the ungrouped IS_VALID and QUALITY_FLAG columns are -1.
+    """
+    query, type_names, filter_names = _bulk_query(start_date, end_date,
+                                                  frametypes, filts)
+
+    groups = [db.t80oa.ImageType_ID, db.t80oa.Filter_ID, db.t80oa.Date]
+    if by_valid is True:
+        groups.append(db.t80oa.is_valid)
+    if by_quality is True:
+        groups.append(db.t80oa.Quality_FLAG)
+
+    counts = {}
+    if len(type_names) > 0:
+        nimages = db.t80oa.id.count()
+        groupby = groups[0]
+        for field in groups[1:]:
+            groupby |= field
+        rows = db(query).select(*(groups + [nimages]), groupby=groupby)
+
+        for row in rows:
+            frametype = type_names[row.t80oa.ImageType_ID]
+            key = (frametype,
+                   _filter_name(frametype, row.t80oa.Filter_ID, filter_names),
+                   row.t80oa.Date)
+            key += tuple(row.t80oa[field.name] for field in groups[3:])
+            # BIAS rows of several Filter_ID collapse in the same key.
+            counts[key] = counts.get(key, 0) + row[nimages]
+
+    if as_array is False:
+        return counts
+
+    matrix = np.zeros(len(counts), dtype=COUNT_DTYPE)
+    for i, key in enumerate(sorted(counts, key=_key_order)):
+        extra = list(key[3:])
+        is_valid = extra.pop(0) if by_valid is True else -1
+        quality = extra.pop(0) if by_quality is True else -1
+        matrix[i] = (key[0], key[1] or "", key[2],
+                     -1 if is_valid is None else is_valid,
+                     -1 if quality is None else quality,
+                     counts[key])
+    return matrix
+
+
 if __name__ == "__main__":
     from datetime import datetime
 
@@ -4,11 +4,18 @@
 Add info in header of image of T80S from Pipeline Data Base.
 """
 
+from collections import OrderedDict
+from glob import glob
+from math import isclose
+import multiprocessing
+import numbers
+import os
+
 from astropy.io import fits
 
 from config import JYPE_VERSION, PATH_ROOT, TILES_VERSION, FILTERS
-from tileinfo import tile_info, get_zp, get_depth2fwhm5s, get_depth3arc5s
-from tileinfo import get_deptharcsec2, get_mjd_for_tiling
+from model import db_read as db
+from tileinfo import TileContext, get_pnames
 
 
 __AUTHOR = "E. S. Pereira"
@@ -16,63 +23,269 @@ __DATE = "10/10/2017"
 __EMAIL = "pereira.somoza@gmail.com"
 
 
-def t80s_header_data(pname, filetype="fz", hdr_pos=0):
-    tile_path = "{0}/{1}/tiles/{2}/{3}".format(PATH_ROOT,
-                                               JYPE_VERSION,
-                                               TILES_VERSION,
-                                               pname)
+# Relative tolerance of the float cards compared with the header.
+HEADER_RTOL = 1e-9
+
+
+def header_cards(ctx, filt):
+    """
+    Return the header cards of the image of a tile in a given filter.
+    Input: ctx: TileContext of the tile
+           filt: Filter name
+    """
+    id_tilesinfo, ref_image_id, fwhm_min, fwhm_max, filter_id, \
+        moffatbeta_mean, noise = ctx.tile_info(filt)
+    zpt, err_zp, calib_procedure = ctx.zp(filt)
+    depth2fwhm5s, depth3arc5s, deptharcsec2 = ctx.depths[filt]
+
+    mjds = ctx.mjds[filt]
+    mjd1_exp, mjd2_exp, mjd3_exp = (mjds + [[None, None]] * 3)[:3]
+
+    return OrderedDict([('PNAME', ctx.pname),
+                        ('IMAGE_ID', id_tilesinfo),
+                        ('REF_IMAGE_ID', ref_image_id),
+                        ('ZPT', zpt),
+                        ('ERRZPT', err_zp),
+                        ('CALIB_PROCEDURE', calib_procedure),
+                        ('MJD1', mjd1_exp[0]),
+                        ('EXPTIME1', mjd1_exp[1]),
+                        ('MJD2', mjd2_exp[0]),
+                        ('EXPTIME2', mjd2_exp[1]),
+                        ('MJD3', mjd3_exp[0]),
+                        ('EXPTIME3', mjd3_exp[1]),
+                        ('FWHM_MIN', fwhm_min),
+                        ('FWHM_MAX', fwhm_max),
+                        ('MOFFATBETA_MEAN', moffatbeta_mean),
+                        ('DEPTH2FWHM5S', depth2fwhm5s),
+                        ('DEPTH3ARC5S', depth3arc5s),
+                        ('DEPTHARCSEC2', deptharcsec2)])
+
+
+def image_hdu(hdul, hdr_pos=None):
+    """
+    Return the HDU at hdr_pos of a fits file or, if hdr_pos is None, its
+    first HDU with an image, as fits.getdata does: the compressed image
+    of a .fz file, not its empty primary HDU.
+    """
+    if hdr_pos is not None:
+        return hdul[hdr_pos]
+    for hdu in hdul:
+        if hdu.is_image and hdu.header.get('NAXIS', 0) > 0:
+            return hdu
+    return hdul[0]
+
+
+def update_header(img_path, cards, hdr_pos=None):
+    """
+    Update the header of the image of a fits file in place (see
+    image_hdu). The pixel data is never decompressed, loaded or
+    rewritten; the file is only resized when the new cards do not fit in
+    the blocks already reserved for the header.
+    """
+    with fits.open(img_path, mode='update', memmap=True,
+                   do_not_scale_image_data=True) as hdul:
+        image_hdu(hdul, hdr_pos).header.update(cards)
+
+
+def _same_value(old, new, rtol=HEADER_RTOL):
+    if isinstance(old, bool) or isinstance(new, bool):
+        return old == new
+    if isinstance(old, numbers.Real) and isinstance(new, numbers.Real):
+        return isclose(float(old), float(new), rel_tol=rtol)
+    if isinstance(old, str) and isinstance(new, str):
+        return old.rstrip() == new.rstrip()
+    return old == new
+
+
+def header_diff(header, cards, rtol=HEADER_RTOL):
+    """
+    Return the list of (keyword, old value, new value) of the cards whose
+    value differs from the header, or that are missing from it (old value
+    None). Numbers are compared with the relative tolerance rtol.
+    """
+    diff = []
+    for key, value in cards.items():
+        if key not in header:
+            diff.append((key, None, value))
+        elif not _same_value(header[key], value, rtol):
+            diff.append((key, header[key], value))
+    return diff
+
+
+def sync_header(img_path, cards, hdr_pos=None, rtol=HEADER_RTOL):
+    """
+    Update the header of the image of a fits file (see image_hdu) only
+    with the cards that changed. Only the header is read for the
+    comparison, and the file is not opened for writing when all cards
+    already hold their values.
+    Return the list of (keyword, old value, new value) of the changes.
+    """
+    with fits.open(img_path, memmap=True,
+                   do_not_scale_image_data=True) as hdul:
+        diff = header_diff(image_hdu(hdul, hdr_pos).header, cards, rtol)
+    if diff:
+        update_header(img_path,
+                      OrderedDict((key, new) for key, _, new in diff),
+                      hdr_pos)
+    return diff
+
+
+def format_diff(diff):
+    """
+    Return the changes returned by sync_header as text, one card by line.
+    """
+    return "\n".join("    {0}: {1} -> {2}".format(key, old, new)
+                     for key, old, new in diff)
+
+
+def _tile_path(pname):
+    return "{0}/{1}/tiles/{2}/{3}".format(PATH_ROOT,
+                                          JYPE_VERSION,
+                                          TILES_VERSION,
+                                          pname)
+
+
+def _img_path(pname, filt, filetype):
+    return "{0}/{1}/{2}_{1}_swp.{3}".format(_tile_path(pname),
+                                            filt,
+                                            pname,
+                                            filetype
+                                            )
+
+
+def t80s_header_data(pname, filetype="fz", hdr_pos=None):
+    ctx = TileContext(pname, FILTERS)
 
     for filt in FILTERS:
-        img_path = "{0}/{1}/{2}_{1}_swp.{3}".format(tile_path,
-                                                    filt,
-                                                    pname,
-                                                    filetype
-                                                    )
+        img_path = _img_path(pname, filt, filetype)
         print("Processing data for img: {0}.".format(img_path))
         print("For filter: {0}.".format(filt))
-        id_tilesinfo, ref_image_id, fwhm_min, fwhm_max, filter_id, \
-            moffatbeta_mean, noise = tile_info(pname, filt)
-        zpt, err_zp, calib_procedure = get_zp(id_tilesinfo)
-        depth2fwhm5s = get_depth2fwhm5s(pname, filt)
-        depth3arc5s = get_depth3arc5s(pname, filt)
-        deptharcsec2 = get_deptharcsec2(pname, filt)
-
-        mjds = get_mjd_for_tiling(pname, filt)
-
-        if len(mjds) > 3:
-            mjd1_exp, mjd2_exp, mjd3_exp = mjds[:3]
-        elif len(mjds) == 3:
-            mjd1_exp, mjd2_exp, mjd3_exp = mjds
-
-        data, hdr = fits.getdata(img_path, header=True)
-
-        hdr['PNAME'] = pname
-        hdr['IMAGE_ID'] = id_tilesinfo
-        hdr['REF_IMAGE_ID'] = ref_image_id
-        hdr['ZPT'] = zpt
-        hdr['ERRZPT'] = err_zp
-        hdr['CALIB_PROCEDURE'] = calib_procedure
-        hdr['MJD1'] = mjd1_exp[0]
-        hdr['EXPTIME1'] = mjd1_exp[1]
-        hdr['MJD2'] = mjd2_exp[0]
-        hdr['EXPTIME2'] = mjd2_exp[1]
-        hdr['MJD3'] = mjd3_exp[0]
-        hdr['EXPTIME3'] = mjd3_exp[1]
-        hdr['FWHM_MIN'] = fwhm_min
-        hdr['FWHM_MAX'] = fwhm_max
-        hdr['MOFFATBETA_MEAN'] = moffatbeta_mean
-        hdr['DEPTH2FWHM5S'] = depth2fwhm5s
-        hdr['DEPTH3ARC5S'] = depth3arc5s
-        hdr['DEPTHARCSEC2'] = deptharcsec2
-
-        fits.writeto(img_path, data, hdr, overwrite=True)
+        if ctx.has_filter(filt) is False:
+            print("No tile info for filter: {0}.".format(filt))
+            continue
+
+        diff = sync_header(img_path, header_cards(ctx, filt), hdr_pos)
+        if diff:
+            print("Updated cards:\n{0}".format(format_diff(diff)))
+        else:
+            print("Header unchanged.")
+
+
+_DB_SEMAPHORE = None
+
+
+def _init_worker(db_semaphore):
+    """
+    Keep the semaphore and open the Data Base connection of a worker
+    process, used by all its jobs.
+    """
+    global _DB_SEMAPHORE
+    _DB_SEMAPHORE = db_semaphore
+    db.reconnect()
+
+
+def _error(err):
+    return "{0}: {1}".format(type(err).__name__, err)
+
+
+def _header_job(job):
+    """
+    Update the header of the images of one tile in a worker process. The
+    data of all filters is fetched at once, holding the semaphore only
+    while the cards are fetched.
+    Return pname and a list of (filt, changed cards, error) by filter.
+    """
+    pname, filetype, hdr_pos = job
+    try:
+        with _DB_SEMAPHORE:
+            ctx = TileContext(pname, FILTERS)
+            cards = OrderedDict((filt, header_cards(ctx, filt))
+                                for filt in FILTERS if ctx.has_filter(filt))
+            db.commit()
+    except Exception as err:
+        return pname, [(filt, [], _error(err)) for filt in FILTERS]
+
+    results = []
+    for filt in FILTERS:
+        if filt not in cards:
+            results.append((filt, [], "No tile info for filter: {0}".format(
+                filt)))
+            continue
+        try:
+            diff = sync_header(_img_path(pname, filt, filetype),
+                               cards[filt], hdr_pos)
+        except Exception as err:
+            results.append((filt, [], _error(err)))
+            continue
+        results.append((filt, diff, None))
+    return pname, results
+
+
+def read_pnames(pnames_file=None, pattern=None, all_pnames=False):
+    """
+    Return a list of PNAME from a file (one per line), from the tile
+    directories matching a glob pattern and/or all from get_pnames.
+    """
+    pnames = []
+    if pnames_file is not None:
+        with open(pnames_file) as pfile:
+            pnames += [line.strip() for line in pfile
+                       if line.strip() and not line.startswith("#")]
+    if pattern is not None:
+        pnames += sorted(os.path.basename(path)
+                         for path in glob(os.path.join(_tile_path(""),
+                                                       pattern))
+                         if os.path.isdir(path))
+    if all_pnames is True:
+        pnames += get_pnames()
+    return list(OrderedDict.fromkeys(pnames))
+
+
+def t80s_header_batch(pnames, filetype="fz", hdr_pos=None, processes=4,
+                      db_connections=2):
+    """
+    Update the header of the images of a list of tiles, distributing one
+    job by tile in a pool of processes. Each process keeps its own Data
+    Base connection, and at most db_connections of them query it at the
+    same time. Images whose header already holds the Data Base values
+    are not rewritten.
+    Return the lists of succeeded and failed (pname, filter) images.
+    """
+    jobs = [(pname, filetype, hdr_pos) for pname in pnames]
+    nimages = len(jobs) * len(FILTERS)
+
+    succeeded = []
+    failed = []
+    nchanged = 0
+    db_semaphore = multiprocessing.BoundedSemaphore(db_connections)
+    pool = multiprocessing.Pool(processes, initializer=_init_worker,
+                                initargs=(db_semaphore,))
+    try:
+        for pname, results in pool.imap_unordered(_header_job, jobs):
+            for filt, diff, error in results:
+                if error is not None:
+                    print("Failed {0} {1}: {2}".format(pname, filt, error))
+                    failed.append((pname, filt, error))
+                    continue
+                succeeded.append((pname, filt))
+                if diff:
+                    nchanged += 1
+                    print("Updated {0} {1}:\n{2}".format(pname, filt,
+                                                         format_diff(diff)))
+    finally:
+        pool.close()
+        pool.join()
+
+    print("Updated {0} of {1} images, {2} unchanged. {3} failed.".format(
+        nchanged, nimages, len(succeeded) - nchanged, len(failed)))
+    return succeeded, failed
 
 
 if __name__ == "__main__":
     import argparse
     import sys
     DESCRIPTION = '''
-    Update Header of combined images for a given Tile.
+    Update Header of combined images for a given Tile or a list of Tiles.
     '''
     PARSER = argparse.ArgumentParser(
         description=DESCRIPTION)
@@ -82,24 +295,55 @@ if __name__ == "__main__":
                         type=str,
                         default=None)
 
+    PARSER.add_argument("-f",
+                        help="File with a list of PNAME, one per line",
+                        type=str,
+                        default=None)
+
+    PARSER.add_argument("-g",
+                        help="Glob pattern of PNAME in the tiles directory",
+                        type=str,
+                        default=None)
+
+    PARSER.add_argument("-a",
+                        help="Process all PNAME from Pipeline Data Base",
+                        action="store_true")
+
+    PARSER.add_argument("-n",
+                        help="Number of processes in batch mode. default 4",
+                        type=int,
+                        default=4)
+
+    PARSER.add_argument("-c",
+                        help="Maximum processes querying the Data Base "
+                        "at the same time in batch mode. default 2",
+                        type=int,
+                        default=2)
+
     PARSER.add_argument("-t",
                         help="Extesion of fits file (fits or fz)",
                         type=str,
                         default='fz')
 
     PARSER.add_argument("-l",
-                        help="Position of header in fits. default 0",
+                        help="Position of header in fits. default the "
+                        "first HDU with an image (1 for fz)",
                         type=int,
-                        default=0)
+                        default=None)
 
     ARGS = PARSER.parse_args()
 
-    if ARGS.p is None:
-        print("Name of tile (PNAME), not passed")
-        sys.exit(0)
-
     if ARGS.t not in ['fits', 'fz']:
         print("No valid fits image format: {}".format(ARGS.t))
         sys.exit(0)
 
+    if ARGS.f is not None or ARGS.g is not None or ARGS.a is True:
+        PNAMES = read_pnames(ARGS.f, ARGS.g, ARGS.a)
+        _, FAILED = t80s_header_batch(PNAMES, ARGS.t, ARGS.l, ARGS.n, ARGS.c)
+        sys.exit(1 if FAILED else 0)
+
+    if ARGS.p is None:
+        print("Name of tile (PNAME), not passed")
+        sys.exit(0)
+
     t80s_header_data(ARGS.p, ARGS.t, ARGS.l)
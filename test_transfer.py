@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- Coding: UTF-8 -*-
+"""
+Tests of the transfer engine between two local directories: resume of an
+interrupted run, verification of DATASUM and CHECKSUM and the bandwidth
+limiter. Run with python -m pytest.
+"""
+import os
+import time
+
+import numpy as np
+from astropy.io import fits
+
+import transfer
+from transfer import BandwidthLimiter, TransferEngine, TransferItem, \
+    directory_manifest
+
+__AUTHOR = "E. S. Pereira"
+__DATE = "18/10/2026"
+__EMAIL = "pereira.somoza@gmail.com"
+
+
+def _source_tree(root):
+    """
+    Write a few files, in subdirectories, under root.
+    """
+    files = {"a.txt": b"a" * 1000,
+             "tiles/b.bin": os.urandom(70000),
+             "tiles/R/c.bin": os.urandom(5000)}
+    for relpath, content in files.items():
+        path = os.path.join(str(root), relpath)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as out:
+            out.write(content)
+    return files
+
+
+def _engine(tmp_path, **kwargs):
+    return TransferEngine(str(tmp_path / "src"), str(tmp_path / "dst"),
+                          str(tmp_path / "ledger.sqlite"), **kwargs)
+
+
+def _read(path):
+    with open(str(path), "rb") as in_file:
+        return in_file.read()
+
+
+def test_transfer_and_skip_on_rerun(tmp_path):
+    files = _source_tree(tmp_path / "src")
+    manifest = directory_manifest(str(tmp_path / "src"))
+
+    summary = _engine(tmp_path).run(manifest)
+    assert len(summary["done"]) == len(files)
+    for relpath, content in files.items():
+        assert _read(tmp_path / "dst" / relpath) == content
+
+    summary = _engine(tmp_path).run(manifest)
+    assert len(summary["skipped"]) == len(files)
+    assert summary["done"] == [] and summary["failed"] == []
+
+
+def test_resume_interrupted_run(tmp_path, monkeypatch):
+    files = _source_tree(tmp_path / "src")
+    manifest = directory_manifest(str(tmp_path / "src"))
+    copy_file = transfer.copy_file
+
+    def interrupted_copy(source, dest, *args, **kwargs):
+        if source.endswith("b.bin"):
+            with open(dest, "wb") as part:
+                part.write(b"partial")
+            raise IOError("interrupted")
+        return copy_file(source, dest, *args, **kwargs)
+
+    monkeypatch.setattr(transfer, "copy_file", interrupted_copy)
+    summary = _engine(tmp_path).run(manifest)
+    assert len(summary["done"]) == len(files) - 1
+    assert [item.relpath for item, _ in summary["failed"]] == \
+        [os.path.join("tiles", "b.bin")]
+    assert os.path.isfile(str(tmp_path / "dst" / "tiles" / "b.bin.part"))
+
+    monkeypatch.setattr(transfer, "copy_file", copy_file)
+    summary = _engine(tmp_path).run(manifest)
+    assert [item.relpath for item in summary["done"]] == \
+        [os.path.join("tiles", "b.bin")]
+    assert len(summary["skipped"]) == len(files) - 1
+    assert _read(tmp_path / "dst" / "tiles" / "b.bin") == \
+        files["tiles/b.bin"]
+    assert not os.path.exists(str(tmp_path / "dst" / "tiles" /
+                                  "b.bin.part"))
+
+
+def _fits_source(root):
+    """
+    Write a FITS image with DATASUM and CHECKSUM under root and return
+    its header.
+    """
+    os.makedirs(str(root))
+    fits.PrimaryHDU(np.arange(100, dtype=np.float32).reshape(10, 10)) \
+        .writeto(str(root / "img.fits"), checksum=True)
+    return fits.getheader(str(root / "img.fits"))
+
+
+def test_checksum_verified(tmp_path):
+    header = _fits_source(tmp_path / "src")
+    item = TransferItem("img.fits", header["DATASUM"], header["CHECKSUM"])
+    summary = _engine(tmp_path).run([item])
+    assert summary["done"] == [item]
+    assert _read(tmp_path / "dst" / "img.fits") == \
+        _read(tmp_path / "src" / "img.fits")
+
+
+def test_checksum_mismatch(tmp_path):
+    header = _fits_source(tmp_path / "src")
+    item = TransferItem("img.fits", str(int(header["DATASUM"]) + 1))
+    summary = _engine(tmp_path).run([item])
+    assert len(summary["failed"]) == 1
+    assert "DATASUM/CHECKSUM" in summary["failed"][0][1]
+    assert os.listdir(str(tmp_path / "dst")) == []
+
+
+def test_bandwidth_limiter():
+    limiter = BandwidthLimiter(1000000)
+    start = time.time()
+    for _ in range(4):
+        limiter.consume(100000)
+    # The first chunk goes at once, the other three wait 0.1 s each.
+    assert time.time() - start >= 0.28
+
+
+def test_engine_bandwidth(tmp_path):
+    _source_tree(tmp_path / "src")
+    start = time.time()
+    summary = _engine(tmp_path, workers=1, bandwidth=20000).run(
+        directory_manifest(str(tmp_path / "src")))
+    assert len(summary["done"]) == 3
+    # One thread copies a.txt, tiles/R/c.bin and then tiles/b.bin, which
+    # waits for the 6000 bytes of the others.
+    assert time.time() - start >= 0.28
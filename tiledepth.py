@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- Coding: UTF-8 -*-
+"""
+Vectorized computation of the depth of T80S tiles, from the rows of
+tileinfo.get_tiles_info.
+"""
+import numpy as np
+
+from lookupcache import FILTER
+
+__AUTHOR = "E. S. Pereira"
+__DATE = "18/10/2026"
+__EMAIL = "pereira.somoza@gmail.com"
+
+
+DEPTH_DTYPE = [('PNAME', 'U30'),
+               ('FILTER', 'U15'),
+               ('IMAGE_ID', 'i8'),
+               ('ZPT', 'f8'),
+               ('DEPTH2FWHM5S', 'f8'),
+               ('DEPTH3ARC5S', 'f8'),
+               ('DEPTHARCSEC2', 'f8')]
+
+
+def _as_float(values):
+    '''
+    Return a float array where None values are NaN.
+    '''
+    return np.array([np.nan if val is None else float(val)
+                     for val in values], dtype=float)
+
+
+def depth2fwhm5s(noise, fwhm_mean, pixscale, zp):
+    '''
+    Return DEPTH2FWHM5S for arrays of noise, fwhm_mean, pixscale and zp.
+    '''
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return -2.5 * np.log10(5 * noise * np.sqrt(fwhm_mean ** 2 * np.pi /
+                                                   pixscale ** 2)) + zp
+
+
+def depth3arc5s(noise, pixscale, zp):
+    '''
+    Return DEPTH3ARC5S for arrays of noise, pixscale and zp.
+    '''
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return -2.5 * np.log10(5 * noise * np.sqrt(2.25 * np.pi /
+                                                   pixscale ** 2)) + zp
+
+
+def deptharcsec2(noise, pixscale, zp):
+    '''
+    Return DEPTHARCSEC2 for arrays of noise, pixscale and zp.
+    '''
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return -2.5 * np.log10(5 * noise * np.sqrt(1 / pixscale ** 2)) + zp
+
+
+def row_depths(rows):
+    '''
+    Return the arrays DEPTH2FWHM5S, DEPTH3ARC5S and DEPTHARCSEC2 of rows
+    joining t80tiles, t80tilesinfo and calib_zp_tiles, as returned by
+    tileinfo.get_tiles_info. Rows without zero point have NaN depth.
+    '''
+    noise = _as_float([row.t80tilesinfo.Noise for row in rows])
+    fwhm_mean = _as_float([row.t80tilesinfo.FWHM_Mean for row in rows])
+    pixscale = _as_float([row.t80tiles.PIXEL_SCALE for row in rows])
+    zp = _as_float([row.calib_zp_tiles.zp for row in rows])
+
+    return (depth2fwhm5s(noise, fwhm_mean, pixscale, zp),
+            depth3arc5s(noise, pixscale, zp),
+            deptharcsec2(noise, pixscale, zp))
+
+
+def get_depths(rows):
+    '''
+    Return a structured array with the depths of all tiles and filters of
+    rows, as returned by tileinfo.get_tiles_info, usually from a single
+    query for a whole release. Tiles without zero point have NaN depth.
+    '''
+    depths = np.zeros(len(rows), dtype=DEPTH_DTYPE)
+    if len(rows) == 0:
+        return depths
+
+    depths['PNAME'] = [row.t80tiles.PName for row in rows]
+    depths['FILTER'] = [FILTER.name(row.t80tilesinfo.Filter_ID)
+                        for row in rows]
+    depths['IMAGE_ID'] = [row.t80tilesinfo.id for row in rows]
+    depths['ZPT'] = _as_float([row.calib_zp_tiles.zp for row in rows])
+    depths['DEPTH2FWHM5S'], depths['DEPTH3ARC5S'], \
+        depths['DEPTHARCSEC2'] = row_depths(rows)
+
+    return depths
+
+
+if __name__ == "__main__":
+    from tileinfo import get_tiles_info
+    print(get_depths(get_tiles_info(['HYDRA_0049'])))
@@ -0,0 +1,310 @@
+#!/usr/bin/env python
+# -*- Coding: UTF-8 -*-
+"""
+Export the header data of the tile images of a whole release, one row
+by tile and filter with the columns of EXPORT_DTYPE, to a CSV file, a
+NumPy .npy/.npz file or a FITS binary table. The columns are the cards
+written by t80s_header_data, as in datasample.csv, plus FILTER, and
+with a MJDn, EXPTIMEn pair by exposure instead of a single EXPTIME.
+The tiles are processed in chunks, with a few bulk queries by chunk, and
+each chunk is written as soon as it is computed, so the whole table is
+never held in memory.
+"""
+import csv
+from math import isnan
+import os
+import struct
+import zipfile
+
+import numpy as np
+from astropy.io import fits
+
+from config import FILTERS
+from fitssum import BLOCK_SIZE
+from lookupcache import FILTER
+import tiledepth
+import tileinfo
+
+__AUTHOR = "E. S. Pereira"
+__DATE = "18/10/2026"
+__EMAIL = "pereira.somoza@gmail.com"
+
+
+# Value of the integer columns without data in the Data Base.
+NULL_INT = -1
+
+EXPORT_DTYPE = [('PNAME', 'U30'),
+                ('FILTER', 'U15'),
+                ('IMAGE_ID', 'i8'),
+                ('REF_IMAGE_ID', 'i8'),
+                ('ZPT', 'f8'),
+                ('ERRZPT', 'f8'),
+                ('CALIB_PROCEDURE', 'i8'),
+                ('MJD1', 'f8'),
+                ('EXPTIME1', 'f8'),
+                ('MJD2', 'f8'),
+                ('EXPTIME2', 'f8'),
+                ('MJD3', 'f8'),
+                ('EXPTIME3', 'f8'),
+                ('FWHM_MIN', 'f8'),
+                ('FWHM_MAX', 'f8'),
+                ('MOFFATBETA_MEAN', 'f8'),
+                ('DEPTH2FWHM5S', 'f8'),
+                ('DEPTH3ARC5S', 'f8'),
+                ('DEPTHARCSEC2', 'f8')]
+
+FORMATS = ("csv", "npy", "npz", "fits")
+
+
+def _as_float(values):
+    return np.array([np.nan if val is None else float(val)
+                     for val in values], dtype='f8')
+
+
+def _as_int(values):
+    return np.array([NULL_INT if val is None else int(val)
+                     for val in values], dtype='i8')
+
+
+def export_rows(pnames, filt_names=FILTERS):
+    '''
+    Return a structured array of EXPORT_DTYPE with the header data of the
+    tiles pnames in the filters filt_names, from two queries.
+    As in the header update, the first row of a tile in a filter is used.
+    '''
+    mjds = tileinfo.get_mjd_for_tilings(pnames, filt_names)
+
+    rows = []
+    seen = set()
+    for row in tileinfo.get_tiles_info(pnames, filt_names):
+        key = (row.t80tiles.PName, FILTER.name(row.t80tilesinfo.Filter_ID))
+        if key not in seen:
+            seen.add(key)
+            rows.append((key, row))
+
+    data = np.zeros(len(rows), dtype=EXPORT_DTYPE)
+    if len(rows) == 0:
+        return data
+
+    info = [row.t80tilesinfo for _, row in rows]
+    zps = [row.calib_zp_tiles for _, row in rows]
+
+    data['PNAME'] = [key[0] for key, _ in rows]
+    data['FILTER'] = [key[1] for key, _ in rows]
+    data['IMAGE_ID'] = _as_int([inf.id for inf in info])
+    data['REF_IMAGE_ID'] = _as_int([inf.RefImage_ID for inf in info])
+    data['ZPT'] = _as_float([zpi.zp for zpi in zps])
+    data['ERRZPT'] = _as_float([zpi.err_zp for zpi in zps])
+    data['CALIB_PROCEDURE'] = _as_int([zpi.calib_procedure for zpi in zps])
+    data['FWHM_MIN'] = _as_float([inf.FWHM_Min for inf in info])
+    data['FWHM_MAX'] = _as_float([inf.FWHM_Max for inf in info])
+    data['MOFFATBETA_MEAN'] = _as_float([inf.MoffatBeta_Mean
+                                         for inf in info])
+    data['DEPTH2FWHM5S'], data['DEPTH3ARC5S'], data['DEPTHARCSEC2'] = \
+        tiledepth.row_depths([row for _, row in rows])
+
+    for j in range(1, 4):
+        data['MJD{0}'.format(j)] = np.nan
+        data['EXPTIME{0}'.format(j)] = np.nan
+    for i, (key, _) in enumerate(rows):
+        for j, (mjd, exptime) in enumerate(mjds.get(key, [])[:3]):
+            data[i]['MJD{0}'.format(j + 1)] = mjd
+            data[i]['EXPTIME{0}'.format(j + 1)] = exptime
+
+    return data
+
+
+def iter_export(pnames=None, filt_names=FILTERS, chunk_size=1000):
+    '''
+    Yield the export rows of the tiles, chunk_size tiles at a time.
+    Input: List of PNAME (None for all tiles, streamed from t80tiles)
+    '''
+    if pnames is None:
+        pnames = tileinfo.iter_pnames(chunk_size)
+
+    chunk = []
+    for pname in pnames:
+        chunk.append(pname)
+        if len(chunk) == chunk_size:
+            yield export_rows(chunk, filt_names)
+            chunk = []
+    if chunk:
+        yield export_rows(chunk, filt_names)
+
+
+def _csv_value(value):
+    if isinstance(value, float) and isnan(value):
+        return ""
+    if isinstance(value, int) and value == NULL_INT:
+        return ""
+    return value
+
+
+def write_csv(path, chunks):
+    '''
+    Write the chunks to a CSV file whose first line, as in
+    datasample.csv, is # and the column names: those of EXPORT_DTYPE.
+    Return the number of rows.
+    '''
+    nrows = 0
+    names = [name for name, _ in EXPORT_DTYPE]
+    with open(path, "w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        csv_file.write("#" + ",".join(names) + "\n")
+        for chunk in chunks:
+            writer.writerows([[_csv_value(value) for value in row]
+                              for row in chunk.tolist()])
+            nrows += len(chunk)
+    return nrows
+
+
+def _npy_header(dtype, nrows):
+    '''
+    Return a .npy 1.0 header for nrows rows of dtype. Its size does not
+    depend on nrows, so it can be rewritten once all rows are known.
+    '''
+    header = "{{'descr': {0!r}, 'fortran_order': False, 'shape': ({1},), }}"
+    header = header.format(np.lib.format.dtype_to_descr(np.dtype(dtype)),
+                           nrows)
+    # Room for nrows up to 20 digits, aligned to 64 bytes.
+    size = len(header) - len(str(nrows)) + 20 + 1
+    size += -(10 + size) % 64
+    header = header.ljust(size - 1) + "\n"
+    return (b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) +
+            header.encode("latin1"))
+
+
+def write_npy(path, chunks):
+    '''
+    Write the chunks to a .npy file. Return the number of rows.
+    '''
+    nrows = 0
+    with open(path, "wb") as npy_file:
+        npy_file.write(_npy_header(EXPORT_DTYPE, 0))
+        for chunk in chunks:
+            npy_file.write(chunk.tobytes())
+            nrows += len(chunk)
+        npy_file.seek(0)
+        npy_file.write(_npy_header(EXPORT_DTYPE, nrows))
+    return nrows
+
+
+def write_npz(path, chunks, name="tiles"):
+    '''
+    Write the chunks to a .npz file, as the array name. Return the number
+    of rows.
+    '''
+    npy_path = path + ".npy.part"
+    try:
+        nrows = write_npy(npy_path, chunks)
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED,
+                             allowZip64=True) as npz_file:
+            npz_file.write(npy_path, name + ".npy")
+    finally:
+        if os.path.isfile(npy_path):
+            os.remove(npy_path)
+    return nrows
+
+
+def _fits_dtype():
+    '''
+    Return EXPORT_DTYPE with byte strings and big endian numbers, the
+    layout of the rows of a FITS binary table.
+    '''
+    return np.dtype([(name, 'S' + kind[1:]) if kind[0] == 'U'
+                     else (name, '>' + kind)
+                     for name, kind in EXPORT_DTYPE])
+
+
+def _fits_headers(dtype, nrows):
+    table = fits.BinTableHDU(np.zeros(0, dtype=dtype), name="TILES")
+    table.header['NAXIS2'] = nrows
+    for i, (name, _) in enumerate(EXPORT_DTYPE):
+        if name in ('IMAGE_ID', 'REF_IMAGE_ID', 'CALIB_PROCEDURE'):
+            table.header['TNULL{0}'.format(i + 1)] = NULL_INT
+    return (fits.PrimaryHDU().header.tostring() +
+            table.header.tostring()).encode("ascii")
+
+
+def write_fits(path, chunks):
+    '''
+    Write the chunks to a FITS binary table, in the first extension.
+    Return the number of rows.
+    '''
+    dtype = _fits_dtype()
+    nrows = 0
+    nbytes = 0
+    with open(path, "wb") as fits_file:
+        fits_file.write(_fits_headers(dtype, 0))
+        for chunk in chunks:
+            data = chunk.astype(dtype).tobytes()
+            fits_file.write(data)
+            nrows += len(chunk)
+            nbytes += len(data)
+        fits_file.write(b"\0" * (-nbytes % BLOCK_SIZE))
+        fits_file.seek(0)
+        fits_file.write(_fits_headers(dtype, nrows))
+    return nrows
+
+
+WRITERS = {"csv": write_csv,
+           "npy": write_npy,
+           "npz": write_npz,
+           "fits": write_fits}
+
+
+def export_tiles(path, fmt=None, pnames=None, filt_names=FILTERS,
+                 chunk_size=1000):
+    '''
+    Export the header data of the tiles to path, in the format fmt (one
+    of FORMATS, by default from the extension of path).
+    Return the number of rows.
+    '''
+    if fmt is None:
+        fmt = os.path.splitext(path)[1].lstrip(".").lower()
+        fmt = "fits" if fmt == "fit" else fmt
+    if fmt not in WRITERS:
+        raise ValueError("No valid export format: {0}".format(fmt))
+    return WRITERS[fmt](path, iter_export(pnames, filt_names, chunk_size))
+
+
+if __name__ == "__main__":
+    import argparse
+    DESCRIPTION = '''Export the header data of all tile images, by tile
+    and filter, to a CSV, npy, npz or FITS file.
+    '''
+    PARSER = argparse.ArgumentParser(
+        description=DESCRIPTION)
+
+    PARSER.add_argument("-o",
+                        help="Output file (.csv, .npy, .npz or .fits)",
+                        type=str,
+                        required=True)
+
+    PARSER.add_argument("-f",
+                        help="Format, default from the output extension",
+                        type=str,
+                        choices=FORMATS,
+                        default=None)
+
+    PARSER.add_argument("-p",
+                        help="File with a list of PNAME, one per line. "
+                        "default all tiles",
+                        type=str,
+                        default=None)
+
+    PARSER.add_argument("-c",
+                        help="Number of tiles by chunk. default 1000",
+                        type=int,
+                        default=1000)
+
+    ARGS = PARSER.parse_args()
+
+    PNAMES = None
+    if ARGS.p is not None:
+        with open(ARGS.p) as PFILE:
+            PNAMES = [LINE.strip() for LINE in PFILE
+                      if LINE.strip() and not LINE.startswith("#")]
+
+    NROWS = export_tiles(ARGS.o, ARGS.f, PNAMES, chunk_size=ARGS.c)
+    print("Exported {0} rows to {1}.".format(NROWS, ARGS.o))
@@ -0,0 +1,300 @@
+#!/usr/bin/env python
+# -*- Coding: UTF-8 -*-
+"""
+Footprints of the T80S tiles computed, for all tiles at once, from the
+TAN WCS columns of t80tilesinfo (CRPIX, CRVAL, CD) and the IMAGE_SIZE of
+t80tiles, with batch point-in-footprint, tile overlap and coverage map
+queries in NumPy.
+The sides of a TAN image are great circles, so a footprint is the convex
+spherical polygon of its four corners.
+"""
+import numpy as np
+
+import healpix
+from lookupcache import FILTER
+from model import db_read as db
+
+__AUTHOR = "E. S. Pereira"
+__DATE = "18/10/2026"
+__EMAIL = "pereira.somoza@gmail.com"
+
+
+# Nested HEALPix map used to find the candidate tiles of a query.
+FOOTPRINT_NSIDE = 64
+
+# WCS columns of t80tilesinfo, in the order of tan_pix2world.
+WCS_KEYS = ("CRPIX1", "CRPIX2", "CRVAL1", "CRVAL2", "CD1_1", "CD1_2",
+            "CD2_1", "CD2_2")
+
+
+def unit_vectors(ra, dec):
+    '''
+    Return the unit vectors, in the last axis, of positions in degrees.
+    '''
+    ra, dec = np.radians(ra), np.radians(dec)
+    return np.stack([np.cos(dec) * np.cos(ra),
+                     np.cos(dec) * np.sin(ra),
+                     np.sin(dec)], axis=-1)
+
+
+def vectors_to_radec(vectors):
+    '''
+    Return the (ra, dec), in degrees, of vectors in the last axis.
+    '''
+    ra = np.degrees(np.arctan2(vectors[..., 1], vectors[..., 0])) % 360
+    norm = np.linalg.norm(vectors, axis=-1)
+    dec = np.degrees(np.arcsin(np.clip(vectors[..., 2] / norm, -1, 1)))
+    return ra, dec
+
+
+def tan_pix2world(xpix, ypix, crpix1, crpix2, crval1, crval2, cd11, cd12,
+                  cd21, cd22):
+    '''
+    Return the (ra, dec), in degrees, of pixel coordinates (1-based, as
+    in FITS) of TAN images. All arguments broadcast.
+    '''
+    dx = xpix - crpix1
+    dy = ypix - crpix2
+    xi = np.radians(cd11 * dx + cd12 * dy)
+    eta = np.radians(cd21 * dx + cd22 * dy)
+
+    ra0, dec0 = np.radians(crval1), np.radians(crval2)
+    denom = np.cos(dec0) - eta * np.sin(dec0)
+    ra = ra0 + np.arctan2(xi, denom)
+    dec = np.arctan2(eta * np.cos(dec0) + np.sin(dec0),
+                     np.hypot(xi, denom))
+    return np.degrees(ra) % 360, np.degrees(dec)
+
+
+class TileFootprints(object):
+    """
+    Footprints of a set of tiles.
+    Attr:
+        tile_ids: ID of the tiles in t80tiles
+        pnames: PNAME of the tiles
+        corners: Unit vectors of the corners, shape (N, 4, 3), counter
+        clockwise as seen from inside the sphere
+        centers: Unit vectors of the centers of the bounding caps
+        radius: Radius, in degrees, of the bounding caps
+    """
+
+    def __init__(self, tile_ids, pnames, corners, nside=FOOTPRINT_NSIDE):
+        self.tile_ids = np.asarray(tile_ids, dtype=np.int64)
+        self.pnames = np.asarray(pnames)
+        corners = np.asarray(corners, dtype=float).reshape(-1, 4, 3)
+
+        # Same orientation for all polygons.
+        turn = np.einsum("ij,ij->i", np.cross(corners[:, 0], corners[:, 1]),
+                         corners[:, 2])
+        corners[turn < 0] = corners[turn < 0][:, ::-1]
+        self.corners = corners
+        self._normals = np.cross(corners, np.roll(corners, -1, axis=1))
+
+        centers = corners.sum(axis=1)
+        self.centers = centers / np.linalg.norm(centers, axis=1)[:, None]
+        cos_radius = np.einsum("ijk,ik->ij", corners, self.centers).min(1)
+        self.radius = np.degrees(np.arccos(np.clip(cos_radius, -1, 1)))
+
+        # Pixels of the map touched by the bounding cap of each tile.
+        self.nside = nside
+        tiles, pixels = np.zeros(0, dtype=np.int64), np.zeros(0, np.int64)
+        if len(corners) > 0:
+            ra, dec = vectors_to_radec(self.centers)
+            tiles, pixels = healpix.disc_pixels(nside, ra, dec,
+                                                self.radius.max())
+        order = np.argsort(pixels, kind="stable")
+        self._hpix = pixels[order]
+        self._tiles = tiles[order]
+
+    def __len__(self):
+        return len(self.tile_ids)
+
+    @classmethod
+    def from_wcs(cls, tile_ids, pnames, image_size, crpix1, crpix2, crval1,
+                 crval2, cd11, cd12, cd21, cd22, nside=FOOTPRINT_NSIDE):
+        '''
+        Return the footprints of square TAN images of image_size pixels.
+        All arguments, but nside, are arrays by tile.
+        '''
+        args = [np.asarray(arg, dtype=float)[:, None]
+                for arg in (image_size, crpix1, crpix2, crval1, crval2,
+                            cd11, cd12, cd21, cd22)]
+        # Outer edges of the corner pixels.
+        xpix = 0.5 + np.array([0, 0, 1, 1])[None, :] * args[0]
+        ypix = 0.5 + np.array([0, 1, 1, 0])[None, :] * args[0]
+        ra, dec = tan_pix2world(xpix, ypix, *args[1:])
+        return cls(tile_ids, pnames, unit_vectors(ra, dec), nside)
+
+    @classmethod
+    def from_db(cls, pnames=None, filt=None, nside=FOOTPRINT_NSIDE):
+        '''
+        Return the footprints of the tiles (all if pnames is None) from a
+        single query, using the WCS of the tile info in filt, or of the
+        first tile info of each tile if filt is None. Tile infos without
+        a complete WCS are skipped.
+        '''
+        query = db.t80tilesinfo.Tile_ID == db.t80tiles.id
+        if pnames is not None:
+            query &= db.t80tiles.PName.belongs(pnames)
+        if filt is not None:
+            query &= db.t80tilesinfo.Filter_ID == FILTER.id(filt)
+
+        info = db.t80tilesinfo
+        rows = db(query).select(db.t80tiles.id, db.t80tiles.PName,
+                                db.t80tiles.IMAGE_SIZE, info.CRPIX1,
+                                info.CRPIX2, info.CRVAL1, info.CRVAL2,
+                                info.CD1_1, info.CD1_2, info.CD2_1,
+                                info.CD2_2, orderby=db.t80tilesinfo.id)
+
+        tiles = {}
+        for row in rows:
+            if row.t80tiles.id in tiles or row.t80tiles.IMAGE_SIZE is None:
+                continue
+            if all(row.t80tilesinfo[name] is not None for name in WCS_KEYS):
+                tiles[row.t80tiles.id] = row
+        rows = list(tiles.values())
+        if len(rows) == 0:
+            return cls([], [], np.zeros((0, 4, 3)), nside)
+
+        columns = [[float(row.t80tilesinfo[name]) for row in rows]
+                   for name in WCS_KEYS]
+        return cls.from_wcs([row.t80tiles.id for row in rows],
+                            [row.t80tiles.PName for row in rows],
+                            [row.t80tiles.IMAGE_SIZE for row in rows],
+                            *columns, nside=nside)
+
+    def corners_radec(self):
+        '''
+        Return the (ra, dec) of the corners, arrays of shape (N, 4).
+        '''
+        return vectors_to_radec(self.corners)
+
+    def _candidates(self, ra, dec):
+        '''
+        Return the pairs (position indices, tile indices) of the positions
+        in a pixel touched by the bounding cap of the tile.
+        '''
+        pixels = healpix.ang2pix(self.nside, ra, dec, nest=True)
+        positions, rows = healpix.sorted_rows(self._hpix, pixels)
+        return positions, self._tiles[rows]
+
+    def _inside(self, points, tiles):
+        '''
+        Verify if unit vectors points are inside the footprints of tiles.
+        '''
+        sides = np.einsum("ijk,ik->ij", self._normals[tiles], points)
+        return (sides >= 0).all(axis=1)
+
+    def contains(self, ra, dec):
+        '''
+        Return the pairs (position indices, tile indices) of the positions,
+        in degrees, inside the footprints of the tiles, sorted by position.
+        '''
+        ra = np.atleast_1d(np.asarray(ra, dtype=float))
+        dec = np.atleast_1d(np.asarray(dec, dtype=float))
+        positions, tiles = self._candidates(ra, dec)
+        inside = self._inside(unit_vectors(ra[positions], dec[positions]),
+                              tiles)
+        positions, tiles = positions[inside], tiles[inside]
+        order = np.lexsort((tiles, positions))
+        return positions[order], tiles[order]
+
+    def tiles_of(self, ra, dec):
+        '''
+        Return, for each position, the PNAME of the tiles containing it.
+        '''
+        positions, tiles = self.contains(ra, dec)
+        bounds = np.searchsorted(positions,
+                                 np.arange(np.size(ra) + 1))
+        return [self.pnames[tiles[bounds[i]:bounds[i + 1]]]
+                for i in range(np.size(ra))]
+
+    def _edges_cross(self, first, second):
+        '''
+        Verify if any side of the footprints first crosses a side of the
+        footprints second (arrays of tile indices of the same length).
+        '''
+        a = self.corners[first][:, :, None, :]
+        b = np.roll(self.corners[first], -1, axis=1)[:, :, None, :]
+        c = self.corners[second][:, None, :, :]
+        d = np.roll(self.corners[second], -1, axis=1)[:, None, :, :]
+        n1 = np.cross(a, b)
+        n2 = np.cross(c, d)
+        cross = np.cross(n1, n2)
+        found = np.zeros(len(first), dtype=bool)
+        for sign in (1, -1):
+            point = sign * cross
+            on_ab = ((np.einsum("...k,...k", np.cross(a, point), n1) >= 0) &
+                     (np.einsum("...k,...k", np.cross(point, b), n1) >= 0))
+            on_cd = ((np.einsum("...k,...k", np.cross(c, point), n2) >= 0) &
+                     (np.einsum("...k,...k", np.cross(point, d), n2) >= 0))
+            found |= (on_ab & on_cd).any(axis=(1, 2))
+        return found
+
+    def overlaps(self):
+        '''
+        Return the pairs (i, j), i < j, of tile indices whose footprints
+        overlap.
+        '''
+        # Tiles touching a same pixel of the map.
+        index, rows = healpix.sorted_rows(self._hpix, self._hpix)
+        first, second = self._tiles[index], self._tiles[rows]
+        keys = np.unique((first * len(self) + second)[first < second])
+        first, second = keys // len(self), keys % len(self)
+        cos_max = np.cos(np.radians(self.radius[first] +
+                                    self.radius[second]))
+        close = np.einsum("ij,ij->i", self.centers[first],
+                          self.centers[second]) >= cos_max
+        first, second = first[close], second[close]
+
+        overlap = self._edges_cross(first, second)
+        for corner in range(4):
+            overlap |= self._inside(self.corners[first, corner], second)
+            overlap |= self._inside(self.corners[second, corner], first)
+        first, second = first[overlap], second[overlap]
+        order = np.lexsort((second, first))
+        return first[order], second[order]
+
+    def coverage(self, nside=256, nest=True):
+        '''
+        Return a HEALPix map of nside with the number of tiles covering
+        the center of each pixel.
+        '''
+        ra, dec = healpix.pix2ang(nside,
+                                  np.arange(healpix.nside2npix(nside)),
+                                  nest)
+        positions, _ = self.contains(ra, dec)
+        return np.bincount(positions, minlength=healpix.nside2npix(nside))
+
+
+if __name__ == "__main__":
+    import argparse
+    DESCRIPTION = '''Compute the footprints of the tiles and print the
+    tiles containing a position, or the overlapping pairs of tiles.
+    '''
+    PARSER = argparse.ArgumentParser(
+        description=DESCRIPTION)
+
+    PARSER.add_argument("-r",
+                        help="RA of the position, in degrees",
+                        type=float,
+                        default=None)
+
+    PARSER.add_argument("-d",
+                        help="DEC of the position, in degrees",
+                        type=float,
+                        default=None)
+
+    PARSER.add_argument("-o",
+                        help="Print the overlapping pairs of tiles",
+                        action="store_true")
+
+    ARGS = PARSER.parse_args()
+
+    FOOTPRINTS = TileFootprints.from_db()
+    print("{0} tiles.".format(len(FOOTPRINTS)))
+    if ARGS.r is not None and ARGS.d is not None:
+        print(" ".join(FOOTPRINTS.tiles_of(ARGS.r, ARGS.d)[0]))
+    if ARGS.o is True:
+        for FIRST, SECOND in zip(*FOOTPRINTS.overlaps()):
+            print(FOOTPRINTS.pnames[FIRST], FOOTPRINTS.pnames[SECOND])
@@ -3,24 +3,31 @@
 """
 Get Tile Info from Pipeline Data Base.
 """
-from model import db
+from model import db_read as db
 from astropy.time import Time
-from math import log10, sqrt, pow, pi
+from math import isnan
+from config import FILTERS
+from lookupcache import FILTER
+import tiledepth
 
 __AUTHOR = "E. S. Pereira"
 __DATE = "10/10/2017"
 __EMAIL = "pereira.somoza@gmail.com"
 
 
-def get_tile(pname, filt_name):
+def get_tile(pname, filt_name=None):
     """
     Return data form tile table.
-    INPUT: pname, filt_name
+    INPUT: pname
+    Optional INPUT: filt_name: t80tiles has one row by tile for all
+    filters, so the filter only validates the name: None is returned if
+    there is no such filter, as from the former product with the filter
+    table.
     """
-    query = db((db.t80tiles.PName == pname)
-               &
-               (db.filter.Name == filt_name)
-               )
+    if filt_name is not None and FILTER.id(filt_name) is None:
+        return None
+
+    query = db(db.t80tiles.PName == pname)
 
     tile_info = query.select(db.t80tiles.id, db.t80tiles.RA, db.t80tiles.DEC,
                              db.t80tiles.PIXEL_SCALE, db.t80tiles.IMAGE_SIZE
@@ -28,27 +35,13 @@ def get_tile(pname, filt_name):
     return tile_info
 
 
-def get_mjd_for_tiling(pname, filt_name):
+def _mjd_exptime(images):
     '''
-    Return a list of MJD and Exposure time of image used to produce a tile.
-    INPUT: PNAme
-           Fileter
+    Convert rows with Date, Time and ExpTime of t80oa in a list of
+    [MJD, Exposure time].
     '''
-
-    tile_info = get_tile(pname, filt_name)
-
-    query = db(db.t80tileImgs.Tile_ID == tile_info.id)
-    rcid = query.select(db.t80tileImgs.RC_ID)
-    proc_images = [db(db.rc.id == rcidi.RC_ID).select(db.rc.ori_id).first()
-                   for rcidi in rcid
-                   ]
-
-    images = [db(db.t80oa.id == primg.ori_id).select(db.t80oa.Date,
-                                                     db.t80oa.Time,
-                                                     db.t80oa.ExpTime,
-                                                     ).first()
-              for primg in proc_images
-              ]
+    if len(images) == 0:
+        return []
 
     image_date_time = ["{0}T{1}".format(img.Date.strftime("%Y-%m-%d"),
                                         img.Time.strftime("%H:%M:%S"))
@@ -60,6 +53,82 @@ def get_mjd_for_tiling(pname, filt_name):
             for i in range(len(images))]
 
 
+def _tiling_images_query(tile_ids, filter_ids):
+    '''
+    Return the joined query t80tileImgs -> rc -> t80oa for a list of
+    tile ids, restricted to the exposures in a list of filter ids.
+    '''
+    return db((db.t80tileImgs.Tile_ID.belongs(tile_ids))
+              &
+              (db.t80tileImgs.RC_ID == db.rc.id)
+              &
+              (db.rc.ori_id == db.t80oa.id)
+              &
+              (db.t80oa.Filter_ID.belongs(filter_ids))
+              )
+
+
+def get_mjd_for_tiling(pname, filt_name):
+    '''
+    Return a list of MJD and Exposure time of image used to produce a tile,
+    only the exposures in the filter.
+    INPUT: PNAme
+           Fileter
+    '''
+
+    tile_info = get_tile(pname, filt_name)
+
+    query = _tiling_images_query([tile_info.id], [FILTER.id(filt_name)])
+    images = query.select(db.t80oa.Date,
+                          db.t80oa.Time,
+                          db.t80oa.ExpTime,
+                          orderby=db.t80tileImgs.id)
+
+    return _mjd_exptime(images)
+
+
+def get_mjd_for_tilings(pnames, filt_names):
+    '''
+    Return the MJD and Exposure time of images used to produce a set of
+    tiles, in a dict indexed by (pname, filt_name), each with only the
+    exposures in its filter.
+    INPUT: List of PNAme
+           List of Fileter
+    '''
+    filter_ids = FILTER.ids(filt_names)
+    query = db(db.t80tiles.PName.belongs(pnames))
+    tiles = query.select(db.t80tiles.id, db.t80tiles.PName)
+
+    keys = {}
+    for tile in tiles:
+        for filt_name, filter_id in filter_ids.items():
+            key = (tile.PName, filt_name)
+            if key not in keys:
+                keys[key] = (tile.id, filter_id)
+
+    if len(keys) == 0:
+        return {}
+
+    query = _tiling_images_query(list(set(tile.id for tile in tiles)),
+                                 list(filter_ids.values()))
+    images = query.select(db.t80tileImgs.Tile_ID,
+                          db.t80oa.Filter_ID,
+                          db.t80oa.Date,
+                          db.t80oa.Time,
+                          db.t80oa.ExpTime,
+                          orderby=db.t80tileImgs.id)
+
+    mjd_exptime = _mjd_exptime([img.t80oa for img in images])
+
+    by_tile = {}
+    for img, mjd in zip(images, mjd_exptime):
+        by_tile.setdefault((img.t80tileImgs.Tile_ID, img.t80oa.Filter_ID),
+                           []).append(mjd)
+
+    return {key: by_tile.get(tile_filter, [])
+            for key, tile_filter in keys.items()}
+
+
 def get_pnames():
     '''
     Return all PName from t80tiles
@@ -69,6 +138,15 @@ def get_pnames():
     return pname
 
 
+def iter_pnames(chunk_size=1000):
+    '''
+    Yield all PName from t80tiles, streamed in chunks of chunk_size.
+    '''
+    for pname, in db.iter_select(db.t80tiles, [db.t80tiles.PName],
+                                 chunk_size):
+        yield pname
+
+
 def get_zp(id_tilesinfo):
     '''
     Return zp info:
@@ -84,70 +162,38 @@ def get_zp(id_tilesinfo):
     return [zp_info.zp, zp_info.err_zp, zp_info.calib_procedure]
 
 
-def get_depth2fwhm5s(pname, filt_name):
+def _tile_depths(pname, filt_name):
     '''
-    Return DEPTH2FWHM5S for a given pname and filt_name
+    Return [DEPTH2FWHM5S, DEPTH3ARC5S, DEPTHARCSEC2] of a tile in a
+    filter, computed by tiledepth as for TileContext, with None values
+    when there is no tile info or zero point.
     '''
-    info = tile_info(pname, filt_name)
-    fwhm_mean = info[0]
+    rows = get_tiles_info([pname], [filt_name])
+    if len(rows) == 0:
+        return [None, None, None]
+    return [None if isnan(col[0]) else float(col[0])
+            for col in tiledepth.row_depths([rows.first()])]
 
-    tile = get_tile(pname, filt_name)
-    pixscale = tile.PIXEL_SCALE
-    zp = get_zp(tile.id)
-    if zp[0] is None:
-        return None
 
-    # It is necessary verify if the correct noise is from t80tilesinf table
-    noise = info[-1]
-    depth2fwhm5s = -2.5 * log10(5 * float(noise) *
-                                sqrt((pow(float(fwhm_mean), 2)
-                                      * pi) /
-                                     pow(pixscale, 2)
-                                     )
-                                ) + zp[0]
-    return depth2fwhm5s
+def get_depth2fwhm5s(pname, filt_name):
+    '''
+    Return DEPTH2FWHM5S for a given pname and filt_name
+    '''
+    return _tile_depths(pname, filt_name)[0]
 
 
 def get_depth3arc5s(pname, filt_name):
     '''
     Return DEPTH3ARC5S for a given tile pname and filt_name
     '''
-
-    tile = get_tile(pname, filt_name)
-    pixscale = tile.PIXEL_SCALE
-    zp = get_zp(tile.id)
-
-    if zp[0] is None:
-        return None
-
-    # It is necessary verify if the correct noise is from t80tilesinf table
-
-    noise = tile_info(pname, filt_name)[-1]
-    depth3arc5s = -2.5 * log10(5 * float(noise) * sqrt((2.25 *
-                                                        pi) /
-                                                       pow(pixscale, 2)
-                                                       )
-                               ) + zp[0]
-    return depth3arc5s
+    return _tile_depths(pname, filt_name)[1]
 
 
 def get_deptharcsec2(pname, filt_name):
     '''
     Return DEPTHARCSEC2 for a given tile pname and filt_name
     '''
-    tile = get_tile(pname, filt_name)
-    pixscale = tile.PIXEL_SCALE
-    zp = get_zp(tile.id)
-
-    if zp[0] is None:
-        return None
-
-    # It is necessary verify if the correct noise is from t80tilesinf table
-
-    noise = tile_info(pname, filt_name)[-1]
-    deptharcsec2 = -2.5 * log10(5 * float(noise) * sqrt(1 / pow(pixscale, 2))
-                                ) + zp
-    return deptharcsec2
+    return _tile_depths(pname, filt_name)[2]
 
 
 def tile_info(pname, filt_name):
@@ -159,7 +205,9 @@ def tile_info(pname, filt_name):
 
     query = db((db.t80tiles.PName == pname)
                &
-               (db.filter.Name == filt_name)
+               (db.t80tilesinfo.Tile_ID == db.t80tiles.id)
+               &
+               (db.t80tilesinfo.Filter_ID == FILTER.id(filt_name))
                )
     tile_info = query.select(db.t80tilesinfo.id,
                              db.t80tilesinfo.RefImage_ID,
@@ -176,6 +224,127 @@ def tile_info(pname, filt_name):
             ]
 
 
+def get_tiles_info(pnames=None, filt_names=None):
+    '''
+    Return, in a single query, the tile, tilesinfo and zero point data
+    for a set of tiles.
+    Input: List of PNAME (None for all tiles)
+           List of filt_name (None for all filters)
+    '''
+    query = db.t80tilesinfo.Tile_ID == db.t80tiles.id
+    if pnames is not None:
+        query &= db.t80tiles.PName.belongs(pnames)
+    if filt_names is not None:
+        filter_ids = list(FILTER.ids(filt_names).values())
+        query &= db.t80tilesinfo.Filter_ID.belongs(filter_ids)
+
+    left = db.calib_zp_tiles.on(db.calib_zp_tiles.id_tilesinfo ==
+                                db.t80tilesinfo.id)
+
+    return db(query).select(db.t80tiles.id,
+                            db.t80tiles.PName,
+                            db.t80tiles.PIXEL_SCALE,
+                            db.t80tilesinfo.id,
+                            db.t80tilesinfo.RefImage_ID,
+                            db.t80tilesinfo.FWHM_Mean,
+                            db.t80tilesinfo.FWHM_Min,
+                            db.t80tilesinfo.FWHM_Max,
+                            db.t80tilesinfo.Filter_ID,
+                            db.t80tilesinfo.MoffatBeta_Mean,
+                            db.t80tilesinfo.Noise,
+                            db.calib_zp_tiles.zp,
+                            db.calib_zp_tiles.err_zp,
+                            db.calib_zp_tiles.calib_procedure,
+                            left=left)
+
+
+class TileContext(object):
+    '''
+    Data of a tile used to fill the header of its images, fetched from the
+    Pipeline Data Base once for all filters.
+    INPUT: PNAME
+    Optional INPUT: filt_names: Filters of the tile, default config.FILTERS
+    '''
+
+    def __init__(self, pname, filt_names=FILTERS):
+        self.pname = pname
+        self.filt_names = tuple(filt_names)
+        self._cache = {}
+
+    def _cached(self, key, loader):
+        if key not in self._cache:
+            self._cache[key] = loader()
+        return self._cache[key]
+
+    def _load_rows(self):
+        rows = get_tiles_info([self.pname], self.filt_names)
+        info = {}
+        for row in rows:
+            filt_name = FILTER.name(row.t80tilesinfo.Filter_ID)
+            if filt_name not in info:
+                info[filt_name] = row
+        return info
+
+    def _load_mjds(self):
+        mjds = get_mjd_for_tilings([self.pname], self.filt_names)
+        return {filt: mjds.get((self.pname, filt), [])
+                for filt in self.filt_names}
+
+    def _load_depths(self):
+        filts = [filt for filt in self.filt_names if filt in self.rows]
+        rows = [self.rows[filt] for filt in filts]
+
+        columns = tiledepth.row_depths(rows)
+
+        return {filt: [None if isnan(col[i]) else float(col[i])
+                       for col in columns]
+                for i, filt in enumerate(filts)}
+
+    @property
+    def rows(self):
+        """
+        Joined t80tiles, t80tilesinfo and calib_zp_tiles row by filter.
+        """
+        return self._cached('rows', self._load_rows)
+
+    @property
+    def mjds(self):
+        """
+        List of [MJD, Exposure time] by filter.
+        """
+        return self._cached('mjds', self._load_mjds)
+
+    @property
+    def depths(self):
+        """
+        [DEPTH2FWHM5S, DEPTH3ARC5S, DEPTHARCSEC2] by filter.
+        """
+        return self._cached('depths', self._load_depths)
+
+    def has_filter(self, filt_name):
+        """
+        Verify if there are tile info for a given filter.
+        """
+        return filt_name in self.rows
+
+    def tile_info(self, filt_name):
+        '''
+        Return Tile Info in the same layout of tile_info.
+        '''
+        info = self.rows[filt_name].t80tilesinfo
+        return [info.id, info.RefImage_ID, info.FWHM_Min,
+                info.FWHM_Max, info.Filter_ID, info.MoffatBeta_Mean,
+                info.Noise
+                ]
+
+    def zp(self, filt_name):
+        '''
+        Return zp info in the same layout of get_zp.
+        '''
+        zp_info = self.rows[filt_name].calib_zp_tiles
+        return [zp_info.zp, zp_info.err_zp, zp_info.calib_procedure]
+
+
 if __name__ == "__main__":
     # print(get_pnames())
     tile_images = get_mjd_for_tiling('HYDRA_0049', 'R')
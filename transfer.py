@@ -0,0 +1,318 @@
+#!/usr/bin/env python
+# -*- Coding: UTF-8 -*-
+"""
+Transfer engine of the Auto Transfer Bot: copy the files of a manifest
+with a pool of threads, verify them against the DATASUM and CHECKSUM
+stored in the Pipeline Data Base and record the state of each file in a
+SQLite ledger, so an interrupted run resumes without copying finished
+files again.
+The checksums are computed while copying, so each file is read once; the
+time of the copy stage therefore includes the checksums, and the verify
+stage only their comparison.
+"""
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import os
+import shutil
+import threading
+import time
+
+from config import JYPE_VERSION, PATH_ROOT, TILES_VERSION
+from fitssum import FitsSum
+from ledger import TransferLedger
+from lookupcache import FILTER
+from metrics import TransferMetrics
+from model import db
+
+__AUTHOR = "E. S. Pereira"
+__DATE = "18/10/2026"
+__EMAIL = "pereira.somoza@gmail.com"
+
+
+TransferItem = namedtuple("TransferItem",
+                          ["relpath", "datasum", "checksum", "tile_id"])
+TransferItem.__new__.__defaults__ = (None, None, None)
+
+COPY_BUFFER = 2880 * 1024
+
+
+class BandwidthLimiter(object):
+    """
+    Limit the throughput of all threads sharing it to bytes_per_second.
+    """
+
+    def __init__(self, bytes_per_second):
+        self.bytes_per_second = float(bytes_per_second)
+        self._lock = threading.Lock()
+        self._next_time = time.time()
+
+    def consume(self, nbytes):
+        """
+        Wait until nbytes more can be transferred within the limit.
+        """
+        with self._lock:
+            now = time.time()
+            start = max(self._next_time, now)
+            self._next_time = start + nbytes / self.bytes_per_second
+        if start > now:
+            time.sleep(start - now)
+
+
+def _zero_copy(src, dst, nbytes):
+    """
+    Copy nbytes between file objects inside the kernel, when possible.
+    Return the number of bytes copied, 0 at end of file, None if not
+    supported.
+    """
+    try:
+        if hasattr(os, "copy_file_range"):
+            return os.copy_file_range(src.fileno(), dst.fileno(), nbytes)
+        if hasattr(os, "sendfile"):
+            return os.sendfile(dst.fileno(), src.fileno(), None, nbytes)
+    except OSError:
+        pass
+    return None
+
+
+def copy_file(source, dest, summer=None, limiter=None,
+              chunk_size=COPY_BUFFER):
+    """
+    Copy source to dest in chunks of chunk_size, throttled by a
+    BandwidthLimiter. When a FitsSum is given it is fed with each chunk;
+    otherwise the copy is made with copy_file_range or sendfile, so the
+    data never goes through user space.
+    Return the number of bytes copied.
+    """
+    copied = 0
+    with open(source, "rb") as src, open(dest, "wb") as dst:
+        zero_copy = summer is None
+        buf = bytearray(chunk_size)
+        view = memoryview(buf)
+        while True:
+            nbytes = None
+            if zero_copy is True:
+                nbytes = _zero_copy(src, dst, chunk_size)
+                if nbytes is None:
+                    zero_copy = False
+            if nbytes is None:
+                nbytes = src.readinto(buf)
+                if nbytes:
+                    if summer is not None:
+                        summer.update(view[:nbytes])
+                    dst.write(view[:nbytes])
+            if not nbytes:
+                break
+            copied += nbytes
+            if limiter is not None:
+                limiter.consume(nbytes)
+    return copied
+
+
+def tile_relpath(pname, filt, filetype="fz"):
+    """
+    Return the path of a tile image relative to config.PATH_ROOT.
+    """
+    return "{0}/tiles/{1}/{2}/{3}/{2}_{3}_swp.{4}".format(JYPE_VERSION,
+                                                          TILES_VERSION,
+                                                          pname,
+                                                          filt,
+                                                          filetype)
+
+
+def tile_manifest(since=None, filetype="fz"):
+    """
+    Return the TransferItem of the tile images updated after since
+    (a datetime, None for all), with their DATASUM and CHECKSUM from
+    t80tilesinfo.
+    Only the tile images are listed: the t80oa exposures and the
+    t80tilescatalogs files are not, since there is no convention yet for
+    their paths under config.PATH_ROOT.
+    """
+    query = db.t80tilesinfo.Tile_ID == db.t80tiles.id
+    if since is not None:
+        query &= db.t80tilesinfo.UPDATEDATE_tile > since
+
+    rows = db(query).select(db.t80tiles.PName,
+                            db.t80tilesinfo.id,
+                            db.t80tilesinfo.Filter_ID,
+                            db.t80tilesinfo.DATASUM,
+                            db.t80tilesinfo.CHECKSUM,
+                            orderby=db.t80tilesinfo.id)
+
+    return [TransferItem(tile_relpath(row.t80tiles.PName,
+                                      FILTER.name(row.t80tilesinfo.Filter_ID),
+                                      filetype),
+                         row.t80tilesinfo.DATASUM,
+                         row.t80tilesinfo.CHECKSUM,
+                         row.t80tilesinfo.id)
+            for row in rows]
+
+
+def directory_manifest(root):
+    """
+    Return a TransferItem, without checksums, for each file under root.
+    """
+    items = []
+    for dirpath, _, filenames in os.walk(root):
+        for filename in sorted(filenames):
+            path = os.path.join(dirpath, filename)
+            items.append(TransferItem(os.path.relpath(path, root)))
+    return sorted(items)
+
+
+class TransferError(Exception):
+    """
+    A file failed to be copied or verified.
+    """
+
+
+class TransferEngine(object):
+    """
+    Copy the files of a manifest from source_root to dest_root.
+    Attr:
+        source_root: Root directory of the files
+        dest_root: Root directory of the copies, an absolute path
+        ledger_path: SQLite file of the TransferLedger
+    Optional Attr:
+        workers: Number of threads copying files
+        verify: Verify DATASUM and CHECKSUM of the copies
+        bandwidth: Maximum throughput of all threads, in bytes per second
+        metrics: TransferMetrics updated by the engine
+    """
+
+    def __init__(self, source_root, dest_root, ledger_path, workers=4,
+                 verify=True, bandwidth=None, metrics=None):
+        if not dest_root or not os.path.isabs(dest_root):
+            raise ValueError("The destination of the Transfers must be an "
+                             "absolute path: {0!r}".format(dest_root))
+        self.source_root = source_root
+        self.dest_root = dest_root
+        self.workers = workers
+        self.verify = verify
+        self.ledger = TransferLedger(ledger_path)
+        self.limiter = None
+        if bandwidth:
+            self.limiter = BandwidthLimiter(bandwidth)
+        self.metrics = metrics
+        if metrics is None:
+            self.metrics = TransferMetrics()
+
+    def _transfer(self, item):
+        source = os.path.join(self.source_root, item.relpath)
+        dest = os.path.join(self.dest_root, item.relpath)
+        stat = os.stat(source)
+        size = stat.st_size
+        mtime = stat.st_mtime
+
+        if self.ledger.is_done(item.relpath, size, mtime) and \
+                os.path.isfile(dest) and os.path.getsize(dest) == size:
+            return "skipped"
+
+        self.ledger.record(item, "started", size, mtime)
+        if os.path.isdir(os.path.dirname(dest)) is False:
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+
+        summer = None
+        if self.verify is True and \
+                (item.datasum is not None or item.checksum is not None):
+            summer = FitsSum()
+
+        part = dest + ".part"
+        with self.metrics.stage("copy"):
+            copied = copy_file(source, part, summer, self.limiter)
+        self.metrics.add_bytes(copied)
+
+        if summer is not None:
+            with self.metrics.stage("verify"):
+                matches = summer.matches(item.datasum, item.checksum)
+            if not matches:
+                os.remove(part)
+                raise TransferError("DATASUM/CHECKSUM do not match")
+
+        os.replace(part, dest)
+        shutil.copystat(source, dest)
+        self.ledger.record(item, "done")
+        return "done"
+
+    def _run_item(self, item):
+        try:
+            status, error = self._transfer(item), None
+        except Exception as err:
+            status = "failed"
+            error = "{0}: {1}".format(type(err).__name__, err)
+            self.ledger.record(item, status, error=error)
+        self.metrics.add_file(status)
+        return item, status, error
+
+    def run(self, manifest):
+        """
+        Transfer all items of a manifest. Return a dict with the lists of
+        done, skipped and failed items.
+        """
+        summary = {"done": [], "skipped": [], "failed": []}
+        self.ledger.add_pending(manifest)
+        self.metrics.start_run(len(manifest))
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for item, status, error in pool.map(self._run_item,
+                                                    manifest):
+                    summary[status].append((item, error) if error else item)
+        finally:
+            self.metrics.finish_run()
+        return summary
+
+
+if __name__ == "__main__":
+    import argparse
+    DESCRIPTION = '''Transfer all files of a directory to another,
+    resuming a previous interrupted transfer.
+    '''
+    PARSER = argparse.ArgumentParser(
+        description=DESCRIPTION)
+
+    PARSER.add_argument("-s",
+                        help="Source directory",
+                        type=str,
+                        default=PATH_ROOT)
+
+    PARSER.add_argument("-d",
+                        help="Destination directory, an absolute path",
+                        type=str,
+                        required=True)
+
+    PARSER.add_argument("-w",
+                        help="Number of threads. default 4",
+                        type=int,
+                        default=4)
+
+    PARSER.add_argument("-b",
+                        help="Maximum bandwidth, in MB/s",
+                        type=float,
+                        default=None)
+
+    PARSER.add_argument("-m",
+                        help="SQLite ledger of the transfers",
+                        type=str,
+                        default="./transfer_ledger.sqlite")
+
+    PARSER.add_argument("-j",
+                        help="Append the transfer metrics, as JSON lines, "
+                        "to this file",
+                        type=str,
+                        default=None)
+
+    ARGS = PARSER.parse_args()
+
+    if not os.path.isabs(ARGS.d):
+        PARSER.error("The destination directory must be an absolute path")
+
+    ENGINE = TransferEngine(ARGS.s, ARGS.d, ARGS.m, ARGS.w,
+                            bandwidth=ARGS.b and ARGS.b * 1024 ** 2)
+    SUMMARY = ENGINE.run(directory_manifest(ARGS.s))
+    for failed, error in SUMMARY["failed"]:
+        print("Failed {0}: {1}".format(failed.relpath, error))
+    print("Done: {0}. Skipped: {1}. Failed: {2}.".format(
+        len(SUMMARY["done"]), len(SUMMARY["skipped"]),
+        len(SUMMARY["failed"])))
+    if ARGS.j is not None:
+        ENGINE.metrics.append_jsonl(ARGS.j)